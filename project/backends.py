@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Execution Backends for Video Game Dataset Analysis
+This module expresses the cleaning, lookup-join and aggregation steps as a
+small set of operations that run on pandas, Polars or in-process DuckDB.
+The backend is chosen with the VG_BACKEND environment variable.
+"""
+
+import os
+import sys
+import string
+import threading
+import pandas as pd
+import numpy as np
+
+from cleaning import DATE_FORMAT, clean_text_categories, parse_dates_by_category, map_categories
+from enrichment import enrich
+
+DEFAULT_BACKEND = 'pandas'
+
+# Charts rows used by --check-parity, checked in next to the lookup tables
+PARITY_SAMPLE = 'data/samples/vg_charts_parity.csv'
+
+# Aggregation names accepted by group_agg
+AGGREGATIONS = ('sum', 'mean', 'count', 'nunique')
+
+# Each backend implements the same operations. Cleaning operations take a
+# native frame and return a new one; query operations return a native frame
+# (filter_rows) or small pandas results. filter_rows ranges are inclusive
+# (low, high) pairs where None leaves that side open. group_agg drops rows
+# with a missing group key, as pandas groupby does.
+
+class PandasBackend:
+    """Eager pandas execution; frames are pandas DataFrames."""
+
+    name = 'pandas'
+
+    def from_pandas(self, df):
+        # Operations only replace whole columns, so a shallow copy is enough
+        return df.copy(deep=False)
+
+    def to_pandas(self, frame):
+        return frame.reset_index(drop=True)
+
+    # Cleaning operations
+    def fill_null(self, frame, columns, value):
+        for col in columns:
+            frame[col] = frame[col].fillna(value)
+        return frame
+
+    def normalize_text(self, frame, columns, missing):
+        for col in columns:
+            frame[col] = clean_text_categories(frame[col], missing)
+        return frame
+
+    def parse_date(self, frame, column, target, date_format=DATE_FORMAT):
+        frame[target] = parse_dates_by_category(frame[column], date_format)
+        return frame
+
+    def date_year(self, frame, column, target):
+        frame[target] = frame[column].dt.year
+        return frame
+
+    def floor_to(self, frame, column, step, target):
+        frame[target] = (frame[column] // step) * step
+        return frame
+
+    def row_sum(self, frame, columns, target):
+        total = frame[columns[0]]
+        for col in columns[1:]:
+            total = total + frame[col]
+        frame[target] = total
+        return frame
+
+    def all_not_null(self, frame, columns, target):
+        frame[target] = frame[columns].notna().all(axis=1)
+        return frame
+
+    def map_values(self, frame, column, mapping, default, target):
+        frame[target] = map_categories(frame[column], mapping, default)
+        return frame
+
+    def lookup_join(self, frame, lookup, left_key, right_key, columns):
+        enrich(frame, lookup, left_key, right_key, columns)
+        return frame
+
+    # Query operations
+    def filter_rows(self, frame, equals=None, ranges=None, isin=None):
+        mask = np.ones(len(frame), dtype=bool)
+        for col, value in (equals or {}).items():
+            mask &= (frame[col] == value).to_numpy()
+        for col, (low, high) in (ranges or {}).items():
+            if low is not None:
+                mask &= (frame[col] >= low).to_numpy()
+            if high is not None:
+                mask &= (frame[col] <= high).to_numpy()
+        for col, values in (isin or {}).items():
+            mask &= frame[col].isin(values).to_numpy()
+        return frame[mask]
+
+    def n_rows(self, frame):
+        return len(frame)
+
+    def n_unique(self, frame, column):
+        return frame[column].nunique()
+
+    def column_sums(self, frame, columns):
+        return frame[columns].sum()
+
+    def column_mean(self, frame, column):
+        return frame[column].mean()
+
+    def group_agg(self, frame, by, aggs, sort_by=None, limit=None):
+        grouped = frame.groupby(by).agg(**{out: (col, fn) for out, (col, fn) in aggs.items()})
+        result = grouped.reset_index()
+        return _order_result(result, by, sort_by, limit)
+
+    def top_n(self, frame, n, by, columns):
+        return frame.nlargest(n, by)[columns].reset_index(drop=True)
+
+class PolarsBackend:
+    """Multi-threaded Polars execution; frames are polars DataFrames."""
+
+    name = 'polars'
+
+    def __init__(self):
+        try:
+            import polars as pl
+        except ImportError:
+            raise ImportError("The polars backend needs Polars: pip install --user polars")
+        self.pl = pl
+
+    def from_pandas(self, df):
+        return self.pl.from_pandas(df.reset_index(drop=True))
+
+    def to_pandas(self, frame):
+        return _nan_for_missing(frame.to_pandas())
+
+    def fill_null(self, frame, columns, value):
+        pl = self.pl
+        return frame.with_columns([pl.col(c).fill_null(value).fill_nan(value) for c in columns])
+
+    def normalize_text(self, frame, columns, missing):
+        pl = self.pl
+        exprs = []
+        for col in columns:
+            text = pl.col(col).cast(pl.Utf8).str.strip_chars()
+            exprs.append(pl.when(text.is_null() | (text == 'nan')).then(pl.lit(missing))
+                         .otherwise(text).alias(col))
+        return frame.with_columns(exprs)
+
+    def parse_date(self, frame, column, target, date_format=DATE_FORMAT):
+        pl = self.pl
+        text = pl.col(column).cast(pl.Utf8)
+        # strptime skips leading spaces; pandas rejects them, so such values stay null
+        parsed = pl.when(text == text.str.strip_chars()).then(
+            text.str.strptime(pl.Datetime('ns'), date_format, strict=False, exact=True))
+        return frame.with_columns(parsed.alias(target))
+
+    def date_year(self, frame, column, target):
+        return frame.with_columns(self.pl.col(column).dt.year().cast(self.pl.Float64).alias(target))
+
+    def floor_to(self, frame, column, step, target):
+        return frame.with_columns(((self.pl.col(column) // step) * step).alias(target))
+
+    def row_sum(self, frame, columns, target):
+        pl = self.pl
+        total = pl.col(columns[0])
+        for col in columns[1:]:
+            total = total + pl.col(col)
+        return frame.with_columns(total.alias(target))
+
+    def all_not_null(self, frame, columns, target):
+        pl = self.pl
+        return frame.with_columns(pl.all_horizontal([pl.col(c).is_not_null() for c in columns]).alias(target))
+
+    def map_values(self, frame, column, mapping, default, target):
+        pl = self.pl
+        expr = pl.col(column).replace_strict(mapping, default=default, return_dtype=pl.Utf8)
+        return frame.with_columns(expr.alias(target))
+
+    def lookup_join(self, frame, lookup, left_key, right_key, columns):
+        pl = self.pl
+        right = self.from_pandas(lookup).unique(subset=[right_key], keep='first', maintain_order=True)
+        right = right.select([pl.col(right_key).alias('__key')] +
+                             [pl.col(src).alias(dst) for src, dst in columns.items()])
+        joined = (frame.with_row_index('__pos')
+                  .join(right, left_on=left_key, right_on='__key', how='left')
+                  .sort('__pos'))
+        return joined.drop([c for c in ('__pos', '__key') if c in joined.columns])
+
+    def filter_rows(self, frame, equals=None, ranges=None, isin=None):
+        pl = self.pl
+        predicate = pl.lit(True)
+        for col, value in (equals or {}).items():
+            predicate = predicate & (pl.col(col) == value)
+        for col, (low, high) in (ranges or {}).items():
+            if low is not None:
+                predicate = predicate & (pl.col(col) >= low)
+            if high is not None:
+                predicate = predicate & (pl.col(col) <= high)
+        for col, values in (isin or {}).items():
+            predicate = predicate & pl.col(col).is_in(list(values))
+        return frame.filter(predicate)
+
+    def n_rows(self, frame):
+        return frame.height
+
+    def n_unique(self, frame, column):
+        return frame[column].drop_nulls().n_unique()
+
+    def column_sums(self, frame, columns):
+        sums = frame.select([self.pl.col(c).sum() for c in columns]).row(0)
+        return pd.Series(sums, index=columns, dtype=float)
+
+    def column_mean(self, frame, column):
+        mean = frame[column].mean()
+        return np.nan if mean is None else mean
+
+    def group_agg(self, frame, by, aggs, sort_by=None, limit=None):
+        pl = self.pl
+        exprs = []
+        for out, (col, fn) in aggs.items():
+            expr = {'sum': pl.col(col).sum(), 'mean': pl.col(col).mean(),
+                    'count': pl.col(col).count(), 'nunique': pl.col(col).drop_nulls().n_unique()}[fn]
+            exprs.append(expr.alias(out))
+        keyed = frame.drop_nulls(subset=by)
+        result = keyed.group_by(by).agg(exprs).to_pandas()
+        return _order_result(result, by, sort_by, limit)
+
+    def top_n(self, frame, n, by, columns):
+        top = frame.sort(by, descending=True, nulls_last=True, maintain_order=True).head(n)
+        return top.select(columns).to_pandas()
+
+class DuckDBBackend:
+    """In-process DuckDB execution; frames are lazy SQL queries.
+
+    Operations nest SQL subqueries and nothing runs until a result is
+    fetched, so DuckDB plans and parallelises each query as a whole. Every
+    frame carries a __pos column holding the original row order, so results
+    come back in the same order as the other backends. DuckDB column names
+    are case-insensitive, so a joined column that differs from an existing
+    one only by case (Country vs country) is stored under another name and
+    renamed back in to_pandas.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self):
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("The duckdb backend needs DuckDB: pip install --user duckdb")
+        self.con = duckdb.connect()
+        # One connection is shared, so queries from server threads take turns
+        self._lock = threading.RLock()
+        self._tables = 0
+        self._renamed = {}
+
+    def _fetch_df(self, query):
+        with self._lock:
+            return self.con.sql(query).df()
+
+    def _fetch_one(self, query):
+        with self._lock:
+            return self.con.sql(query).fetchone()
+
+    def _columns(self, frame):
+        with self._lock:
+            return self.con.sql(frame).columns
+
+    def from_pandas(self, df):
+        df = df.reset_index(drop=True).assign(__pos=np.arange(len(df)))
+        with self._lock:
+            self._tables += 1
+            name = f't{self._tables}'
+            self.con.register(name, df)
+        return f'SELECT * FROM {name}'
+
+    def to_pandas(self, frame):
+        df = self._fetch_df(f'SELECT * FROM ({frame}) ORDER BY __pos')
+        return _nan_for_missing(df.drop(columns='__pos').rename(columns=self._renamed))
+
+    def _replace(self, frame, exprs):
+        replaced = ', '.join(f'{expr} AS {_quote(col)}' for col, expr in exprs.items())
+        return f'SELECT * REPLACE ({replaced}) FROM ({frame})'
+
+    def _add(self, frame, col, expr):
+        return f'SELECT *, {expr} AS {_quote(col)} FROM ({frame})'
+
+    def fill_null(self, frame, columns, value):
+        return self._replace(frame, {
+            c: f"CASE WHEN isnan({_quote(c)}) THEN {value} ELSE coalesce({_quote(c)}, {value}) END"
+            for c in columns
+        })
+
+    def normalize_text(self, frame, columns, missing):
+        exprs = {}
+        for col in columns:
+            text = f"regexp_replace(CAST({_quote(col)} AS VARCHAR), '^\\s+|\\s+$', '', 'g')"
+            exprs[col] = (f"CASE WHEN {_quote(col)} IS NULL OR {text} = 'nan' "
+                          f"THEN {_literal(missing)} ELSE {text} END")
+        return self._replace(frame, exprs)
+
+    def parse_date(self, frame, column, target, date_format=DATE_FORMAT):
+        text = f"CAST({_quote(column)} AS VARCHAR)"
+        # try_strptime ignores surrounding spaces; pandas rejects them, so such values stay NULL
+        parsed = f"CASE WHEN {text} = trim({text}, {_literal(string.whitespace)}) THEN try_strptime({text}, {_literal(date_format)}) END"
+        return self._add(frame, target, f"CAST({parsed} AS TIMESTAMP_NS)")
+
+    def date_year(self, frame, column, target):
+        return self._add(frame, target, f"CAST(year({_quote(column)}) AS DOUBLE)")
+
+    def floor_to(self, frame, column, step, target):
+        return self._add(frame, target, f"floor({_quote(column)} / {step}) * {step}")
+
+    def row_sum(self, frame, columns, target):
+        return self._add(frame, target, ' + '.join(_quote(c) for c in columns))
+
+    def all_not_null(self, frame, columns, target):
+        return self._add(frame, target, ' AND '.join(f'{_quote(c)} IS NOT NULL' for c in columns))
+
+    def map_values(self, frame, column, mapping, default, target):
+        cases = ' '.join(f"WHEN {_literal(k)} THEN {_literal(v)}" for k, v in mapping.items())
+        return self._add(frame, target, f"CASE {_quote(column)} {cases} ELSE {_literal(default)} END")
+
+    def lookup_join(self, frame, lookup, left_key, right_key, columns):
+        right = self.from_pandas(lookup)
+        existing = {c.lower() for c in self._columns(frame)}
+        selected = []
+        for src, dst in columns.items():
+            if dst.lower() in existing:
+                stored = f'{dst}__{len(self._renamed) + 1}'
+                self._renamed[stored] = dst
+                dst = stored
+            selected.append(f'r.{_quote(src)} AS {_quote(dst)}')
+        first_rows = (f"SELECT * FROM ({right}) "
+                      f"QUALIFY row_number() OVER (PARTITION BY {_quote(right_key)} ORDER BY __pos) = 1")
+        return (f"SELECT l.*, {', '.join(selected)} FROM ({frame}) l "
+                f"LEFT JOIN ({first_rows}) r ON l.{_quote(left_key)} = r.{_quote(right_key)}")
+
+    def filter_rows(self, frame, equals=None, ranges=None, isin=None):
+        terms = ['TRUE']
+        for col, value in (equals or {}).items():
+            terms.append(f'{_quote(col)} = {_literal(value)}')
+        for col, (low, high) in (ranges or {}).items():
+            if low is not None:
+                terms.append(f'{_quote(col)} >= {_literal(low)}')
+            if high is not None:
+                terms.append(f'{_quote(col)} <= {_literal(high)}')
+        for col, values in (isin or {}).items():
+            listed = ', '.join(_literal(v) for v in values) or 'NULL'
+            terms.append(f'{_quote(col)} IN ({listed})')
+        return f"SELECT * FROM ({frame}) WHERE {' AND '.join(terms)}"
+
+    def n_rows(self, frame):
+        return self._fetch_one(f'SELECT count(*) FROM ({frame})')[0]
+
+    def n_unique(self, frame, column):
+        return self._fetch_one(f'SELECT count(DISTINCT {_quote(column)}) FROM ({frame})')[0]
+
+    def column_sums(self, frame, columns):
+        sums = ', '.join(f'coalesce(sum({_quote(c)}), 0)' for c in columns)
+        return pd.Series(self._fetch_one(f'SELECT {sums} FROM ({frame})'), index=columns, dtype=float)
+
+    def column_mean(self, frame, column):
+        mean = self._fetch_one(f'SELECT avg({_quote(column)}) FROM ({frame})')[0]
+        return np.nan if mean is None else mean
+
+    def group_agg(self, frame, by, aggs, sort_by=None, limit=None):
+        sql_fn = {'sum': 'sum({})', 'mean': 'avg({})', 'count': 'count({})', 'nunique': 'count(DISTINCT {})'}
+        keys = ', '.join(_quote(c) for c in by)
+        selected = ', '.join(f'{sql_fn[fn].format(_quote(col))} AS {_quote(out)}'
+                             for out, (col, fn) in aggs.items())
+        not_null = ' AND '.join(f'{_quote(c)} IS NOT NULL' for c in by)
+        result = self._fetch_df(f'SELECT {keys}, {selected} FROM ({frame}) WHERE {not_null} GROUP BY {keys}')
+        return _order_result(result, by, sort_by, limit)
+
+    def top_n(self, frame, n, by, columns):
+        cols = ', '.join(_quote(c) for c in columns)
+        return self._fetch_df(f'SELECT {cols} FROM ({frame}) ORDER BY {_quote(by)} DESC NULLS LAST, __pos '
+                              f'LIMIT {int(n)}')
+
+BACKENDS = {
+    'pandas': PandasBackend,
+    'polars': PolarsBackend,
+    'duckdb': DuckDBBackend
+}
+
+def _quote(identifier):
+    """Quote a column name for SQL."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+def _literal(value):
+    """Render a Python value as a SQL literal."""
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    if isinstance(value, (bool, np.bool_)):
+        return 'TRUE' if value else 'FALSE'
+    return repr(value.item() if isinstance(value, np.generic) else value)
+
+def _nan_for_missing(df):
+    """Use NaN for missing values in text columns, as pandas itself does."""
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+def _order_result(result, by, sort_by, limit):
+    """Sort an aggregate by its group keys, or by sort_by descending with keys as tie-breakers."""
+    if sort_by is None:
+        result = result.sort_values(by, kind='stable')
+    else:
+        result = result.sort_values([sort_by] + by, ascending=[False] + [True] * len(by), kind='stable')
+    if limit is not None:
+        result = result.head(limit)
+    return result.reset_index(drop=True)
+
+def get_backend(name=None):
+    """Return the configured backend (argument, then VG_BACKEND, then pandas)."""
+    name = name or os.environ.get('VG_BACKEND', DEFAULT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
+
+def available_backends():
+    """Return the names of the backends whose libraries are installed."""
+    names = []
+    for name, cls in BACKENDS.items():
+        try:
+            cls()
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+def _parity_outputs(backend, datasets, sample_rows):
+    """Run cleaning, merging and the dashboard aggregations on one backend."""
+    from data_preprocessing import clean_charts_data, clean_other_datasets, merge_datasets
+
+    charts = datasets['charts'].head(sample_rows)
+    clean = clean_charts_data(charts, backend=backend)
+    merged = merge_datasets(clean, clean_other_datasets(datasets), backend=backend)
+
+    frame = backend.from_pandas(merged)
+    filtered = backend.filter_rows(frame, ranges={'year': (1990, 2015)})
+    return {
+        'clean': clean,
+        'merged': merged,
+        'column_sums': backend.column_sums(filtered, ['na_sales', 'jp_sales', 'pal_sales', 'other_sales'])
+                              .to_frame('sales'),
+        'platform_sales': backend.group_agg(filtered, ['platform'], {'total_sales': ('total_sales', 'sum')},
+                                            sort_by='total_sales', limit=15),
+        'publisher_stats': backend.group_agg(filtered, ['publisher'], {
+            'total_sales_sum': ('total_sales', 'sum'),
+            'avg_sales_per_game': ('total_sales', 'mean'),
+            'game_count': ('total_sales', 'count'),
+            'avg_critic_score': ('critic_score', 'mean')
+        }),
+        'yearly_genre': backend.group_agg(filtered, ['year', 'genre'], {'total_sales': ('total_sales', 'sum')}),
+        'top_games': backend.top_n(filtered, 20, 'total_sales', ['title', 'platform', 'total_sales']),
+        'kpis': pd.DataFrame({'value': [backend.n_rows(filtered), backend.n_unique(filtered, 'platform'),
+                                        backend.column_mean(filtered, 'total_sales')]})
+    }
+
+def check_parity(sample_rows=5000, charts_path=PARITY_SAMPLE):
+    """Check that every installed backend gives the same results as pandas.
+
+    The charts rows come from a small checked-in sample (with release dates
+    in several layouts, most of which must parse to missing) so anyone can
+    run the check; the lookup tables are the checked-in ones in data/.
+    Returns a list of (backend, output, error) tuples for any mismatch.
+    """
+    from data_preprocessing import DATASET_FILES, load_dataset
+
+    datasets = {name: load_dataset(name) for name in DATASET_FILES if name != 'charts'}
+    datasets['charts'] = pd.read_csv(charts_path)
+    expected = _parity_outputs(PandasBackend(), datasets, sample_rows)
+    failures = []
+    for name in available_backends():
+        if name == 'pandas':
+            continue
+        actual = _parity_outputs(get_backend(name), datasets, sample_rows)
+        for key, frame in expected.items():
+            try:
+                pd.testing.assert_frame_equal(
+                    actual[key].reset_index(drop=True), frame.reset_index(drop=True),
+                    check_dtype=False, check_exact=False, rtol=1e-9, check_datetimelike_compat=True
+                )
+                print(f"  ✓ {name}: {key}")
+            except AssertionError as e:
+                failures.append((name, key, str(e)))
+                print(f"  ✗ {name}: {key}\n{e}")
+    return failures
+
+if __name__ == "__main__":
+    if '--check-parity' not in sys.argv:
+        print("Usage: python backends.py --check-parity [CHARTS_CSV]")
+        sys.exit(2)
+    paths = [arg for arg in sys.argv[1:] if arg != '--check-parity']
+    print(f"Checking backend parity on: {', '.join(available_backends())}")
+    sys.exit(1 if check_parity(charts_path=paths[0] if paths else PARITY_SAMPLE) else 0)
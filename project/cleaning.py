@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Category-Level Cleaning Helpers for Video Game Dataset Analysis
+This module cleans repetitive columns by working on each distinct value once
+and broadcasting the result back to every row through integer codes.
+"""
+
+import pandas as pd
+import numpy as np
+
+# Date format used by release_date and last_update in the raw charts data
+DATE_FORMAT = '%Y-%m-%d'
+
+def _broadcast(codes, unique_values, missing, series):
+    """Expand per-unique results back to rows; code -1 marks a missing value."""
+    values = np.append(unique_values, [missing]).take(codes)
+    return pd.Series(values, index=series.index, name=series.name)
+
+def clean_text_categories(series, missing='Unknown'):
+    """Strip whitespace and replace missing values, once per distinct string.
+
+    Matches astype(str).str.strip() followed by replacing 'nan' with the
+    missing label, but the string work scales with the number of distinct
+    values instead of the number of rows.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    cleaned = pd.Index(uniques).astype(str).str.strip()
+    cleaned = np.where(cleaned == 'nan', missing, cleaned).astype(object)
+    return _broadcast(codes, cleaned, missing, series)
+
+def parse_dates_by_category(series, date_format=DATE_FORMAT):
+    """Parse each distinct date string once and broadcast back to the rows.
+
+    Values must match the format exactly, as with the single format pandas
+    infers for the whole column; anything else (other layouts, surrounding
+    spaces, a time part) becomes NaT. The Polars and DuckDB backends apply
+    the same rule.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=date_format, errors='coerce')
+    return _broadcast(codes, parsed.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'), series)
+
+def map_categories(series, mapping, default):
+    """Map each distinct value through a dictionary once, filling misses with default."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapped = pd.Series(uniques, dtype=object).map(mapping).fillna(default).to_numpy(dtype=object)
+    return _broadcast(codes, mapped, default, series)
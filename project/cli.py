@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Command-Line Interface for Video Game Dataset Analysis
+This script is the single entry point for preprocessing, profiling, serving
+the dashboard, exporting and querying. Heavy libraries (pandas, plotly, dash,
+pyarrow, ...) are only imported inside the subcommand that needs them, so
+light commands such as query start quickly.
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+# Modules that light commands must not import
+HEAVY_MODULES = {'pandas', 'numpy', 'pyarrow', 'plotly', 'dash', 'dash_bootstrap_components',
+                 'matplotlib', 'seaborn', 'polars', 'duckdb'}
+
+# Seconds a light command may take, including interpreter start-up
+STARTUP_BUDGET = 0.5
+
+def cmd_preprocess(args):
+    """Run the preprocessing pipeline."""
+    if args.backend:
+        os.environ['VG_BACKEND'] = args.backend
+    from data_preprocessing import main
+    main(workers=args.workers, track_memory=not args.no_memory, incremental=args.incremental)
+
+def cmd_profile(args):
+    """Profile CSV files in one streaming pass."""
+    from profiler import main
+    if args.output:
+        main(args.paths, args.chunksize, args.workers, args.output)
+    else:
+        main(args.paths, args.chunksize, args.workers)
+
+def cmd_serve(args):
+    """Start the dashboard."""
+    if args.backend:
+        os.environ['VG_BACKEND'] = args.backend
+    from main import app
+    print(f"Dashboard will be available at: http://{args.host}:{args.port}")
+    app.run(debug=args.debug, host=args.host, port=args.port)
+
+def cmd_export(args):
+    """Write the exploration report, or a processed table as CSV or Parquet."""
+    if args.target == 'report':
+        from report import write_report, REPORT_FILE
+        write_report(output=args.output or REPORT_FILE, workers=args.workers)
+        return
+    from storage import read_table
+    df = read_table(args.target, columns=args.columns)
+    output = args.output or f'{args.target}.csv'
+    if output.endswith('.parquet'):
+        df.to_parquet(output, index=False)
+    else:
+        df.to_csv(output, index=False)
+    print(f"✓ Exported {len(df):,} rows of {args.target} to {output}")
+
+def cmd_query(args):
+    """Answer KPI queries from the metrics store."""
+    from metrics import METRICS_FILE, list_metrics, query
+    path = args.path or METRICS_FILE
+    if args.list:
+        list_metrics(path)
+    else:
+        query(args.names, args.json, path)
+
+def _imported_modules(importtime_log):
+    """Return the top-level module names listed in -X importtime output."""
+    names = set()
+    for line in importtime_log.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            if name != 'imported package':
+                names.add(name.split('.')[0])
+    return names
+
+def cmd_check_startup(args):
+    """Check that light commands stay within the start-up budget and import nothing heavy."""
+    from metrics import METRICS_FILE
+
+    commands = [['--help']] + [[name, '--help'] for name in COMMANDS]
+    if os.path.exists(METRICS_FILE):
+        commands += [['query'], ['query', '--list']]
+
+    failures = 0
+    for argv in commands:
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', os.path.abspath(__file__), *argv],
+                                capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        heavy = sorted(_imported_modules(result.stderr) & HEAVY_MODULES)
+        ok = result.returncode == 0 and elapsed <= args.budget and not heavy
+        failures += not ok
+        detail = f"imports {', '.join(heavy)}" if heavy else f"exit {result.returncode}" if result.returncode else ''
+        print(f"  {'✓' if ok else '⚠'} {' '.join(argv):<22} {elapsed:6.3f}s  {detail}")
+
+    print(f"\n{len(commands) - failures}/{len(commands)} commands within {args.budget:.2f}s "
+          f"without heavy imports")
+    sys.exit(1 if failures else 0)
+
+# name -> (handler, help)
+COMMANDS = {
+    'preprocess': (cmd_preprocess, "clean, merge and save the datasets"),
+    'profile': (cmd_profile, "profile CSV files in one streaming pass"),
+    'serve': (cmd_serve, "start the dashboard"),
+    'export': (cmd_export, "write the exploration report or export a processed table"),
+    'query': (cmd_query, "answer KPI queries from the metrics store"),
+    'check-startup': (cmd_check_startup, "check start-up time and imports of light commands")
+}
+
+def build_parser():
+    """Build the argument parser for every subcommand."""
+    parser = argparse.ArgumentParser(description="Video game dataset analysis tools.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    commands = {name: subparsers.add_parser(name, help=text) for name, (_, text) in COMMANDS.items()}
+
+    p = commands['preprocess']
+    p.add_argument('--workers', type=int, default=4, help="pipeline stages to run at once (default: 4)")
+    p.add_argument('--no-memory', action='store_true', help="skip per-stage (approximate) peak memory tracking")
+    p.add_argument('--backend', help="pandas, polars or duckdb (default: $VG_BACKEND or pandas)")
+    p.add_argument('--incremental', action='store_true', help="patch processed data with recent changes")
+
+    p = commands['profile']
+    p.add_argument('paths', nargs='*', help="CSV files to profile (default: all raw datasets)")
+    p.add_argument('--chunksize', type=int, default=100_000, help="rows per chunk (default: 100000)")
+    p.add_argument('--workers', type=int, default=1, help="processes sketching chunks (default: 1)")
+    p.add_argument('--output', help="JSON output path (default: processed_data/profiles.json)")
+
+    p = commands['serve']
+    p.add_argument('--host', default='127.0.0.1', help="interface to bind (default: 127.0.0.1)")
+    p.add_argument('--port', type=int, default=8050, help="port to listen on (default: 8050)")
+    p.add_argument('--debug', action='store_true', help="enable Dash debug mode and reloading")
+    p.add_argument('--backend', help="pandas, polars or duckdb (default: $VG_BACKEND or pandas)")
+
+    p = commands['export']
+    p.add_argument('target', help="'report' or the name of a processed table such as charts")
+    p.add_argument('--output', help="output path; .parquet writes Parquet, anything else CSV")
+    p.add_argument('--columns', nargs='+', help="table columns to export (default: all)")
+    p.add_argument('--workers', type=int, default=4, help="report stages to build at once (default: 4)")
+
+    p = commands['query']
+    p.add_argument('names', nargs='*', help="metrics to print (default: business-question answers)")
+    p.add_argument('--list', action='store_true', help="list the available metrics")
+    p.add_argument('--json', action='store_true', help="print values as JSON")
+    p.add_argument('--path', help="metrics store (default: processed_data/metrics.json)")
+
+    p = commands['check-startup']
+    p.add_argument('--budget', type=float, default=STARTUP_BUDGET,
+                   help=f"seconds allowed per command (default: {STARTUP_BUDGET})")
+    return parser
+
+def main(argv=None):
+    """Command-line entry point."""
+    args = build_parser().parse_args(argv)
+    handler, _ = COMMANDS[args.command]
+    handler(args)
+
+if __name__ == "__main__":
+    main()
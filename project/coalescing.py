@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Request Coalescing for Video Game Dataset Analysis
+This module tracks the newest filter request generation of each browser
+session, so dashboard callbacks can stop working on requests that a newer
+one from the same session has already made obsolete. Generations are kept
+in the SQLite file of the result cache, so a newer request handled by one
+server process also supersedes an older one still running in another.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+from dash.exceptions import PreventUpdate
+
+from result_cache import CACHE_FILE
+
+# Sessions remembered at once; the least recently active are forgotten first
+MAX_SESSIONS = 10_000
+
+# A session's generation stops superseding anything after this many idle
+# seconds. The store outlives server restarts, and a reused session name
+# numbers its requests from 1 again; without this an earlier run's state
+# would drop every new request from that session
+SESSION_TTL = 60
+
+# Expired sessions, and sessions beyond MAX_SESSIONS, are pruned once every this many requests
+PRUNE_EVERY = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS request_generations (
+    session TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS request_generations_updated ON request_generations (updated);
+"""
+
+class RequestGenerations:
+    """The newest request generation seen per session, shared by all server processes.
+
+    A request is a dict with 'session' and 'generation' keys, numbered by
+    the browser in the order the user made changes. Generations not updated
+    for ttl seconds are ignored and replaced by the next request.
+    """
+
+    def __init__(self, path=CACHE_FILE, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL):
+        self.path = path
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.dropped = 0
+        self._begun = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as con:
+            con.executescript(SCHEMA)
+
+    def _connection(self):
+        """One connection per thread; WAL lets every process read while one writes."""
+        con = getattr(self._local, 'con', None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=10)
+            con.execute('PRAGMA journal_mode=WAL')
+            con.execute('PRAGMA synchronous=NORMAL')
+            self._local.con = con
+        return con
+
+    def _latest(self, session):
+        """The session's newest generation, unless it has expired."""
+        row = self._connection().execute(
+            'SELECT generation FROM request_generations WHERE session = ? AND updated >= ?',
+            (session, time.time() - self.ttl)).fetchone()
+        return None if row is None else row[0]
+
+    def begin(self, request):
+        """Record a new request, and drop it at once if a newer one has already arrived."""
+        now = time.time()
+        con = self._connection()
+        with con:
+            # An older generation leaves a live row unchanged but replaces an expired one
+            con.execute('INSERT INTO request_generations VALUES (?, ?, ?) ON CONFLICT (session) DO UPDATE '
+                        'SET generation = excluded.generation, updated = excluded.updated '
+                        'WHERE excluded.generation >= generation OR updated < ?',
+                        (request['session'], request['generation'], now, now - self.ttl))
+        with self._lock:
+            self._begun += 1
+            prune = self._begun % PRUNE_EVERY == 0
+        if prune:
+            self._prune(con)
+        self.check(request)
+
+    def _prune(self, con):
+        """Forget expired sessions, and the least recently active beyond max_sessions."""
+        with con:
+            con.execute('DELETE FROM request_generations WHERE updated < ?', (time.time() - self.ttl,))
+            con.execute('DELETE FROM request_generations WHERE session NOT IN '
+                        '(SELECT session FROM request_generations ORDER BY updated DESC LIMIT ?)',
+                        (self.max_sessions,))
+
+    def is_current(self, request):
+        """Whether no newer request has arrived from the same session, in any process."""
+        latest = self._latest(request['session'])
+        return latest is None or request['generation'] >= latest
+
+    def check(self, request):
+        """Stop the callback without updating any output if the request is stale."""
+        if not self.is_current(request):
+            with self._lock:
+                self.dropped += 1
+            raise PreventUpdate
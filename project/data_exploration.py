@@ -6,14 +6,11 @@ This script loads and explores all datasets for the CRISP-DM project.
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
 
+from report import FIGURES, add_release_year, write_report
+
 # Set pandas display options
 pd.set_option('display.max_rows', None)
 pd.set_option('display.max_columns', None)
@@ -40,13 +37,18 @@ def load_datasets():
     return datasets
 
 def analyze_dataset(df, name):
-    """Analyze a single dataset and print comprehensive information."""
+    """Analyze a single dataset and print comprehensive information.
+
+    This loads the whole dataset and scans it once per statistic; for large
+    files use profiler.py, which streams the file once in chunks.
+    """
     print(f"\n{'='*60}")
     print(f"DATASET: {name.upper()}")
     print(f"{'='*60}")
     
     print(f"\nShape: {df.shape}")
-    print(f"Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+    memory_mb = df.memory_usage(deep=True).sum() / 1024**2
+    print(f"Memory usage: {memory_mb:.2f} MB")
     
     print(f"\nData Types:")
     print(df.dtypes)
@@ -74,7 +76,7 @@ def analyze_dataset(df, name):
     
     return {
         'shape': df.shape,
-        'memory_usage': df.memory_usage(deep=True).sum() / 1024**2,
+        'memory_usage': memory_mb,
         'missing_values': missing_df,
         'unique_counts': unique_counts,
         'numeric_columns': numeric_cols.tolist()
@@ -87,13 +89,13 @@ def explore_charts_data(df):
     print(f"{'='*60}")
     
     # Sales analysis
-    sales_cols = ['na_sales', 'eu_sales', 'jp_sales', 'other_sales', 'global_sales']
+    sales_cols = ['na_sales', 'jp_sales', 'pal_sales', 'other_sales', 'total_sales']
     print(f"\nSales Statistics:")
     print(df[sales_cols].describe())
     
-    # Top games by global sales
-    print(f"\nTop 10 Games by Global Sales:")
-    top_games = df.nlargest(10, 'global_sales')[['name', 'platform', 'genre', 'global_sales']]
+    # Top games by total sales
+    print(f"\nTop 10 Games by Total Sales:")
+    top_games = df.nlargest(10, 'total_sales')[['title', 'platform', 'genre', 'total_sales']]
     print(top_games)
     
     # Platform analysis
@@ -128,58 +130,25 @@ def explore_charts_data(df):
     }
 
 def create_exploratory_visualizations(df_charts):
-    """Create exploratory visualizations for the charts dataset."""
+    """Create exploratory visualizations for the charts dataset.
+
+    The figures are returned rather than shown; write_report puts them in
+    one HTML file together with the printed statistics.
+    """
     print(f"\n{'='*60}")
     print("CREATING EXPLORATORY VISUALIZATIONS")
     print(f"{'='*60}")
     
-    # 1. Sales distribution by region
-    fig1 = px.box(df_charts, 
-                  y=['na_sales', 'eu_sales', 'jp_sales', 'other_sales'],
-                  title="Sales Distribution by Region",
-                  labels={'value': 'Sales (millions)', 'variable': 'Region'})
-    fig1.show()
-    
-    # 2. Top platforms by number of games
-    platform_counts = df_charts['platform'].value_counts().head(15)
-    fig2 = px.bar(x=platform_counts.index, y=platform_counts.values,
-                 title="Top 15 Platforms by Number of Games",
-                 labels={'x': 'Platform', 'y': 'Number of Games'})
-    fig2.show()
-    
-    # 3. Genre popularity over time
-    genre_year = df_charts.groupby(['year', 'genre']).size().reset_index(name='count')
-    top_genres = df_charts['genre'].value_counts().head(5).index
-    genre_year_top = genre_year[genre_year['genre'].isin(top_genres)]
-    
-    fig3 = px.line(genre_year_top, x='year', y='count', color='genre',
-                   title="Top 5 Genres Popularity Over Time",
-                   labels={'count': 'Number of Games', 'year': 'Release Year'})
-    fig3.show()
-    
-    # 4. Global sales vs critic score
-    fig4 = px.scatter(df_charts.dropna(subset=['critic_score']), 
-                      x='critic_score', y='global_sales',
-                      title="Global Sales vs Critic Score",
-                      labels={'critic_score': 'Critic Score', 'global_sales': 'Global Sales (millions)'},
-                      opacity=0.6)
-    fig4.show()
-    
-    # 5. Regional sales comparison
-    regional_sales = df_charts[['na_sales', 'eu_sales', 'jp_sales', 'other_sales']].sum()
-    fig5 = px.pie(values=regional_sales.values, names=regional_sales.index,
-                  title="Total Sales Distribution by Region")
-    fig5.show()
-    
-    return fig1, fig2, fig3, fig4, fig5
+    return tuple(build(df_charts) for build in FIGURES.values())
 
 def main():
     """Main function to run the data exploration."""
     print("Starting Data Exploration for Video Game Dataset Analysis")
     print("=" * 80)
     
-    # Load datasets
+    # Load datasets; the charts data only has a release date, so derive the year once
     datasets = load_datasets()
+    datasets['charts'] = add_release_year(datasets['charts'])
     
     # Analyze each dataset
     analysis_results = {}
@@ -190,13 +159,12 @@ def main():
     # Detailed analysis of charts data
     charts_analysis = explore_charts_data(datasets['charts'])
     
-    # Create visualizations
-    print("\nCreating exploratory visualizations...")
+    # Write the statistics and figures to one HTML report
+    print("\nCreating exploration report...")
     try:
-        create_exploratory_visualizations(datasets['charts'])
-        print("Visualizations created successfully!")
+        write_report(datasets)
     except Exception as e:
-        print(f"Error creating visualizations: {e}")
+        print(f"Error creating exploration report: {e}")
     
     # Summary
     print(f"\n{'='*60}")
@@ -11,73 +11,85 @@ import sys
 import site
 sys.path.append(site.getusersitepackages())
 
+import argparse
 import pandas as pd
 import numpy as np
 import pickle
 
+from pipeline import stage, run_stages, print_stage_report
+from backends import get_backend, BACKENDS
+from enrichment import report_duplicate_keys
+from entity_resolution import load_aliases, with_aliases
+from storage import write_table, write_manifest
+from subsets import SUBSETS, select_row_ids, save_subset
+from sampling import build_stratified_sample, save_sample
+from metrics import build_metrics, save_metrics
+from validation import validate, save_validation_report
+
+# Raw input files, keyed by dataset name
+DATASET_FILES = {
+    'charts': 'data/vg_charts.csv',
+    'developers': 'data/vg_developers.csv',
+    'publishers': 'data/vg_publishers.csv',
+    'geo_cities': 'data/vg_geo_cities.csv',
+    'geo_countries': 'data/vg_geo_countries.csv'
+}
+
+def load_dataset(name):
+    """Load a single raw dataset."""
+    return pd.read_csv(DATASET_FILES[name])
+
 def load_datasets():
     """Load all raw datasets."""
     print("Loading datasets...")
     datasets = {}
     
-    datasets['charts'] = pd.read_csv('data/vg_charts.csv')
-    datasets['developers'] = pd.read_csv('data/vg_developers.csv')
-    datasets['publishers'] = pd.read_csv('data/vg_publishers.csv')
-    datasets['geo_cities'] = pd.read_csv('data/vg_geo_cities.csv')
-    datasets['geo_countries'] = pd.read_csv('data/vg_geo_countries.csv')
+    for name in DATASET_FILES:
+        datasets[name] = load_dataset(name)
     
     print(f"✓ Loaded {len(datasets)} datasets")
     return datasets
 
-def clean_charts_data(df):
+def clean_charts_data(df, backend=None):
     """Clean and preprocess the main charts dataset."""
     print("\nCleaning VG_CHARTS dataset...")
+    backend = backend or get_backend()
     
-    # Create a copy to avoid modifying original
-    df_clean = df.copy()
+    # Work on the backend's own copy to avoid modifying original
+    frame = backend.from_pandas(df)
     
     # 1. Handle release_date - extract year
     print("  - Processing release dates...")
-    df_clean['release_date_clean'] = pd.to_datetime(df_clean['release_date'], errors='coerce')
-    df_clean['year'] = df_clean['release_date_clean'].dt.year
+    frame = backend.parse_date(frame, 'release_date', 'release_date_clean')
+    frame = backend.date_year(frame, 'release_date_clean', 'year')
     
     # 2. Handle missing sales data
     print("  - Processing sales data...")
+    # Sales completeness indicator, taken before the missing values are filled
+    frame = backend.all_not_null(frame, ['na_sales', 'jp_sales', 'pal_sales', 'other_sales'],
+                                 'has_complete_sales')
+    
     # Fill missing sales with 0 (assuming no sales if missing)
     sales_cols = ['na_sales', 'jp_sales', 'pal_sales', 'other_sales', 'total_sales']
-    df_clean[sales_cols] = df_clean[sales_cols].fillna(0)
+    frame = backend.fill_null(frame, sales_cols, 0)
     
     # 3. Handle missing critic scores
     print("  - Processing critic scores...")
-    df_clean['critic_score'] = df_clean['critic_score'].fillna(0)
+    frame = backend.fill_null(frame, ['critic_score'], 0)
     
     # 4. Clean text fields
     print("  - Cleaning text fields...")
-    text_cols = ['title', 'platform', 'genre', 'publisher', 'developer']
-    for col in text_cols:
-        if col in df_clean.columns:
-            df_clean[col] = df_clean[col].astype(str).str.strip()
-            df_clean[col] = df_clean[col].replace('nan', 'Unknown')
+    text_cols = [col for col in ['title', 'platform', 'genre', 'publisher', 'developer'] if col in df.columns]
+    frame = backend.normalize_text(frame, text_cols, 'Unknown')
     
     # 5. Create derived features
     print("  - Creating derived features...")
     
-    # Total sales verification (should match sum of regional sales)
-    df_clean['calculated_total'] = (df_clean['na_sales'] + 
-                                   df_clean['jp_sales'] + 
-                                   df_clean['pal_sales'] + 
-                                   df_clean['other_sales'])
-    
-    # Sales completeness indicator
-    df_clean['has_complete_sales'] = (
-        df_clean['na_sales'].notna() & 
-        df_clean['jp_sales'].notna() & 
-        df_clean['pal_sales'].notna() & 
-        df_clean['other_sales'].notna()
-    )
+    # Total sales verification (should match sum of regional sales; see validation.py)
+    frame = backend.row_sum(frame, ['na_sales', 'jp_sales', 'pal_sales', 'other_sales'], 'calculated_total')
     
     # Decade classification
-    df_clean['decade'] = (df_clean['year'] // 10) * 10
+    frame = backend.floor_to(frame, 'year', 10, 'decade')
     
     # Platform generation
     platform_generations = {
@@ -87,34 +99,41 @@ def clean_charts_data(df):
         'GB': '4th Gen', 'GBA': '6th Gen', 'DS': '7th Gen', '3DS': '8th Gen',
         'PC': 'PC', 'MAC': 'PC', 'LIN': 'PC'
     }
-    df_clean['platform_generation'] = df_clean['platform'].map(platform_generations).fillna('Other')
+    frame = backend.map_values(frame, 'platform', platform_generations, 'Other', 'platform_generation')
     
+    df_clean = backend.to_pandas(frame)
     print(f"  ✓ Cleaned dataset: {df_clean.shape}")
     return df_clean
 
+def clean_developers(df):
+    """Clean the developers dataset."""
+    print("  - Cleaning developers dataset...")
+    df_dev = df.copy()
+    df_dev['developer'] = df_dev['developer'].astype(str).str.strip()
+    df_dev['city'] = df_dev['city'].fillna('Unknown')
+    df_dev['country'] = df_dev['country'].fillna('Unknown')
+    return df_dev
+
+def clean_publishers(df):
+    """Clean the publishers dataset."""
+    print("  - Cleaning publishers dataset...")
+    df_pub = df.copy()
+    df_pub['publisher'] = df_pub['publisher'].astype(str).str.strip()
+    df_pub['city'] = df_pub['city'].fillna('Unknown')
+    df_pub['country'] = df_pub['country'].fillna('Unknown')
+    return df_pub
+
 def clean_other_datasets(datasets):
     """Clean other datasets."""
     print("\nCleaning other datasets...")
     
     cleaned = {}
     
-    # Clean developers dataset
     if 'developers' in datasets:
-        print("  - Cleaning developers dataset...")
-        df_dev = datasets['developers'].copy()
-        df_dev['developer'] = df_dev['developer'].astype(str).str.strip()
-        df_dev['city'] = df_dev['city'].fillna('Unknown')
-        df_dev['country'] = df_dev['country'].fillna('Unknown')
-        cleaned['developers'] = df_dev
+        cleaned['developers'] = clean_developers(datasets['developers'])
     
-    # Clean publishers dataset
     if 'publishers' in datasets:
-        print("  - Cleaning publishers dataset...")
-        df_pub = datasets['publishers'].copy()
-        df_pub['publisher'] = df_pub['publisher'].astype(str).str.strip()
-        df_pub['city'] = df_pub['city'].fillna('Unknown')
-        df_pub['country'] = df_pub['country'].fillna('Unknown')
-        cleaned['publishers'] = df_pub
+        cleaned['publishers'] = clean_publishers(datasets['publishers'])
     
     # Geo datasets are already clean
     cleaned['geo_cities'] = datasets['geo_cities']
@@ -122,29 +141,34 @@ def clean_other_datasets(datasets):
     
     return cleaned
 
-def merge_datasets(charts_clean, other_datasets):
+def resolve_aliases(lookup, key, entity):
+    """Add the reviewed name aliases for an entity type to its lookup table."""
+    aliases = load_aliases(entity)
+    if aliases:
+        lookup = with_aliases(lookup, key, aliases)
+        print(f"  ✓ Applied {len(aliases)} approved {entity} aliases")
+    return lookup
+
+def merge_datasets(charts_clean, other_datasets, backend=None):
     """Merge datasets for enhanced analysis."""
     print("\nMerging datasets...")
+    backend = backend or get_backend()
     
-    # Merge with developers
-    charts_merged = charts_clean.copy()
+    # Attach lookup columns by unique key; the row count never changes
+    frame = backend.from_pandas(charts_clean)
     if 'developers' in other_datasets:
-        charts_merged = charts_merged.merge(
-            other_datasets['developers'], 
-            on='developer', 
-            how='left',
-            suffixes=('', '_dev')
-        )
+        report_duplicate_keys(other_datasets['developers'], 'developer', 'developers')
+        developers = resolve_aliases(other_datasets['developers'], 'developer', 'developer')
+        frame = backend.lookup_join(frame, developers, 'developer', 'developer',
+                                    {'city': 'city', 'country': 'country'})
         print("  ✓ Merged with developers data")
     
     # Merge with publishers
     if 'publishers' in other_datasets:
-        charts_merged = charts_merged.merge(
-            other_datasets['publishers'], 
-            on='publisher', 
-            how='left',
-            suffixes=('', '_pub')
-        )
+        report_duplicate_keys(other_datasets['publishers'], 'publisher', 'publishers')
+        publishers = resolve_aliases(other_datasets['publishers'], 'publisher', 'publisher')
+        frame = backend.lookup_join(frame, publishers, 'publisher', 'publisher',
+                                    {'city': 'city_pub', 'country': 'country_pub'})
         print("  ✓ Merged with publishers data")
     
     # Merge with geo data for publishers
@@ -152,73 +176,50 @@ def merge_datasets(charts_clean, other_datasets):
         geo_countries = other_datasets['geo_countries'].copy()
         # Clean country names for merging
         geo_countries['Country'] = geo_countries['Country'].str.strip().str.replace('"', '')
-        charts_merged = charts_merged.merge(
-            geo_countries, 
-            left_on='country_pub', 
-            right_on='Country', 
-            how='left',
-            suffixes=('', '_geo')
-        )
+        report_duplicate_keys(geo_countries, 'Country', 'geo_countries')
+        geo_columns = ['Country', 'Alpha-2 code', 'Alpha-3 code', 'Latitude', 'Longitude']
+        frame = backend.lookup_join(frame, geo_countries, 'country_pub', 'Country',
+                                    {col: col for col in geo_columns})
         print("  ✓ Merged with geographic data")
     
+    charts_merged = backend.to_pandas(frame)
+    assert len(charts_merged) == len(charts_clean), "enrichment changed the row count"
+    
+    # Stable row ids let analysis subsets refer to rows instead of copying them
+    charts_merged['row_id'] = np.arange(len(charts_merged))
     print(f"  ✓ Final merged dataset: {charts_merged.shape}")
     return charts_merged
 
 def create_analysis_datasets(df_merged):
-    """Create specialized datasets for different types of analysis."""
+    """Create specialized datasets for different types of analysis.
+
+    Each subset is the array of row ids in the merged table that match its
+    predicate in subsets.SUBSETS, rather than a copy of the rows.
+    """
     print("\nCreating analysis datasets...")
     
     analysis_datasets = {}
-    
-    # 1. Complete sales data only
-    complete_sales = df_merged[df_merged['has_complete_sales']].copy()
-    analysis_datasets['complete_sales'] = complete_sales
-    print(f"  ✓ Complete sales dataset: {complete_sales.shape}")
-    
-    # 2. Recent games (2010+)
-    recent_games = df_merged[df_merged['year'] >= 2010].copy()
-    analysis_datasets['recent_games'] = recent_games
-    print(f"  ✓ Recent games dataset: {recent_games.shape}")
-    
-    # 3. Major publishers only
-    major_publishers = ['Electronic Arts', 'Activision', 'Nintendo', 'Sony Computer Entertainment', 
-                       'Microsoft', 'Ubisoft', 'Sega', 'Konami']
-    major_pub_games = df_merged[df_merged['publisher'].isin(major_publishers)].copy()
-    analysis_datasets['major_publishers'] = major_pub_games
-    print(f"  ✓ Major publishers dataset: {major_pub_games.shape}")
-    
-    # 4. Top platforms only
-    top_platforms = ['PC', 'PS2', 'PS3', 'PS4', 'X360', 'XOne', 'NS', 'DS', '3DS']
-    top_platform_games = df_merged[df_merged['platform'].isin(top_platforms)].copy()
-    analysis_datasets['top_platforms'] = top_platform_games
-    print(f"  ✓ Top platforms dataset: {top_platform_games.shape}")
+    for name, (label, predicate) in SUBSETS.items():
+        analysis_datasets[name] = select_row_ids(df_merged, predicate)
+        print(f"  ✓ {label} dataset: {len(analysis_datasets[name])} rows")
     
     return analysis_datasets
 
-def save_processed_data(charts_clean, charts_merged, analysis_datasets, other_datasets):
-    """Save all processed datasets."""
-    print("\nSaving processed data...")
-    
-    # Create processed data directory
-    os.makedirs('processed_data', exist_ok=True)
-    
-    # Save main datasets
-    charts_clean.to_pickle('processed_data/charts_clean.pkl')
-    charts_merged.to_pickle('processed_data/charts_merged.pkl')
-    print("  ✓ Saved main processed datasets")
-    
-    # Save analysis datasets
-    for name, df in analysis_datasets.items():
-        df.to_pickle(f'processed_data/{name}.pkl')
-    print("  ✓ Saved analysis datasets")
-    
-    # Save other datasets
-    for name, df in other_datasets.items():
-        df.to_pickle(f'processed_data/{name}_clean.pkl')
-    print("  ✓ Saved other cleaned datasets")
-    
-    # Save summary statistics
-    summary_stats = {
+# The merged table is the single stored copy of the games; the cleaned
+# charts table is a column projection of it
+CHARTS_PARTITION_COLS = ['decade', 'platform_generation']
+
+def save_table(df, name, partition_cols=()):
+    """Save one processed dataset as Parquet and return its manifest entry."""
+    return write_table(df, name, partition_cols)
+
+def charts_clean_entry(charts_clean):
+    """Describe charts_clean as a column subset of the stored charts table."""
+    return {'base': 'charts', 'columns': list(charts_clean.columns)}
+
+def build_summary_stats(charts_clean, charts_merged, analysis_datasets):
+    """Build the summary statistics dictionary."""
+    return {
         'original_shape': charts_clean.shape,
         'merged_shape': charts_merged.shape,
         'complete_sales_count': len(analysis_datasets['complete_sales']),
@@ -230,40 +231,102 @@ def save_processed_data(charts_clean, charts_merged, analysis_datasets, other_da
         'genres_count': charts_clean['genre'].nunique(),
         'publishers_count': charts_clean['publisher'].nunique()
     }
-    
+
+def save_summary_stats(summary_stats):
+    """Save the summary statistics dictionary."""
     with open('processed_data/summary_stats.pkl', 'wb') as f:
         pickle.dump(summary_stats, f)
-    print("  ✓ Saved summary statistics")
 
-def main():
+def build_pipeline():
+    """Describe preprocessing as a graph of named stages.
+
+    The CSV reads, the lookup-table cleaning and the table writes do not
+    depend on each other, so the runner can overlap them.
+    """
+    from incremental import input_hashes, compute_watermark, save_state
+
+    other_names = ['developers', 'publishers', 'geo_cities', 'geo_countries']
+
+    stages = [stage(f'load_{name}', lambda name=name: load_dataset(name)) for name in DATASET_FILES]
+    stages += [
+        stage('clean_charts', clean_charts_data, ['load_charts']),
+        stage('clean_developers', clean_developers, ['load_developers']),
+        stage('clean_publishers', clean_publishers, ['load_publishers']),
+        stage('clean_others',
+              lambda dev, pub, cities, countries: {
+                  'developers': dev, 'publishers': pub,
+                  'geo_cities': cities, 'geo_countries': countries
+              },
+              ['clean_developers', 'clean_publishers', 'load_geo_cities', 'load_geo_countries']),
+        stage('merge', merge_datasets, ['clean_charts', 'clean_others']),
+        stage('analysis', create_analysis_datasets, ['merge']),
+        stage('validate', lambda df: save_validation_report(validate(df)), ['merge']),
+        stage('make_output_dir', lambda: os.makedirs('processed_data', exist_ok=True)),
+        stage('save_charts', lambda df, _: save_table(df, 'charts', CHARTS_PARTITION_COLS),
+              ['merge', 'make_output_dir']),
+        stage('save_charts_clean', charts_clean_entry, ['clean_charts']),
+        stage('save_charts_sample', lambda df, _: save_sample(build_stratified_sample(df)),
+              ['merge', 'make_output_dir']),
+        stage('summary_stats', build_summary_stats, ['clean_charts', 'merge', 'analysis']),
+        stage('write_summary_stats', lambda stats, _: save_summary_stats(stats),
+              ['summary_stats', 'make_output_dir']),
+        stage('metrics', build_metrics, ['merge', 'summary_stats'])
+    ]
+    stages += [
+        stage(f'save_{name}',
+              lambda subsets, merged, _, name=name: save_subset(name, subsets[name], len(merged)),
+              ['analysis', 'merge', 'make_output_dir'])
+        for name in SUBSETS
+    ]
+    stages += [
+        stage(f'save_{name}_clean', lambda others, _, name=name: save_table(others[name], f'{name}_clean'),
+              ['clean_others', 'make_output_dir'])
+        for name in other_names
+    ]
+
+    # Publish the manifest, then the incremental state, once every table is on disk
+    table_stages = [s.name for s in stages if s.name.startswith('save_')]
+    stages += [
+        stage('write_manifest',
+              lambda *entries: write_manifest({name[len('save_'):]: entry
+                                               for name, entry in zip(table_stages, entries)}),
+              table_stages),
+        stage('write_metrics', lambda metrics, manifest: save_metrics(metrics, manifest['snapshot']),
+              ['metrics', 'write_manifest']),
+        stage('hash_inputs', input_hashes),
+        stage('save_incremental_state',
+              lambda charts, hashes, *_: save_state(compute_watermark(charts), hashes),
+              ['load_charts', 'hash_inputs', 'write_manifest', 'write_summary_stats', 'write_metrics'])
+    ]
+    return stages
+
+def main(workers=4, track_memory=True, incremental=False):
     """Main preprocessing function."""
     print("=" * 80)
     print("DATA PREPROCESSING FOR VIDEO GAME DATASET ANALYSIS")
     print("=" * 80)
     
-    # Load raw datasets
-    datasets = load_datasets()
+    if incremental:
+        from incremental import run_incremental
+        if run_incremental():
+            print("\n✓ Incremental preprocessing completed successfully!")
+            return
+        print("Falling back to a full rebuild...")
     
-    # Clean main charts dataset
-    charts_clean = clean_charts_data(datasets['charts'])
+    # Run load, clean, merge, subset and save stages in dependency order
+    results, timings = run_stages(build_pipeline(), max_workers=workers, track_memory=track_memory)
+    charts_raw = results['load_charts']
+    charts_clean = results['clean_charts']
+    charts_merged = results['merge']
+    analysis_datasets = results['analysis']
     
-    # Clean other datasets
-    other_datasets_clean = clean_other_datasets(datasets)
-    
-    # Merge datasets
-    charts_merged = merge_datasets(charts_clean, other_datasets_clean)
-    
-    # Create analysis datasets
-    analysis_datasets = create_analysis_datasets(charts_merged)
-    
-    # Save all processed data
-    save_processed_data(charts_clean, charts_merged, analysis_datasets, other_datasets_clean)
+    print_stage_report(timings)
     
     # Print summary
     print("\n" + "=" * 60)
     print("PREPROCESSING SUMMARY")
     print("=" * 60)
-    print(f"Original dataset: {datasets['charts'].shape}")
+    print(f"Original dataset: {charts_raw.shape}")
     print(f"Cleaned dataset: {charts_clean.shape}")
     print(f"Merged dataset: {charts_merged.shape}")
     print(f"Complete sales games: {len(analysis_datasets['complete_sales'])}")
@@ -278,5 +341,21 @@ def main():
     print("\n✓ Data preprocessing completed successfully!")
     print("✓ All processed datasets saved to 'processed_data/' directory")
 
+def parse_args():
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Preprocess the video game datasets.")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="number of pipeline stages to run at once (default: 4)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip per-stage (approximate) peak memory tracking")
+    parser.add_argument('--backend', choices=sorted(BACKENDS),
+                        help="execution backend for cleaning and merging (default: $VG_BACKEND or pandas)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="patch the processed data with changes since the last run")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.backend:
+        os.environ['VG_BACKEND'] = args.backend
+    main(workers=args.workers, track_memory=not args.no_memory, incremental=args.incremental)
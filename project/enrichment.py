@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Lookup Enrichment for Video Game Dataset Analysis
+This module attaches lookup-table columns to the charts data through a unique
+key index and positional takes, so the output always has one row per input row.
+"""
+
+import pandas as pd
+import numpy as np
+
+def report_duplicate_keys(lookup, key, name):
+    """Print and return the keys that appear more than once in a lookup table."""
+    keys = lookup[key]
+    duplicates = keys[keys.duplicated(keep='first')].unique().tolist()
+    if duplicates:
+        print(f"  ⚠ {name}: {len(duplicates)} duplicate key(s), keeping first: "
+              f"{', '.join(map(str, duplicates[:5]))}{' ...' if len(duplicates) > 5 else ''}")
+    return duplicates
+
+def build_key_index(lookup, key):
+    """Index a lookup table by its key, keeping the first row for each key.
+
+    Returns (index, positions): index holds the unique keys and positions
+    the row of the lookup table that each key maps to.
+    """
+    keys = lookup[key]
+    first = ~keys.duplicated(keep='first').to_numpy()
+    return pd.Index(keys[first]), np.flatnonzero(first)
+
+def lookup_codes(values, index, positions):
+    """Return the lookup row for each value, or -1 when it has no match."""
+    codes = index.get_indexer(values)
+    return np.where(codes >= 0, positions.take(codes), -1)
+
+def take_column(lookup_column, rows):
+    """Gather a lookup column by row number, leaving NaN where rows is -1."""
+    # The appended NaN sits at position -1, so unmatched rows pick it up
+    return np.append(lookup_column.to_numpy(), [np.nan]).take(rows)
+
+def enrich(df, lookup, left_key, right_key, columns):
+    """Attach lookup columns to df in place, matching df[left_key] to lookup[right_key].
+
+    columns maps lookup column names to the names they get in df. The row
+    count of df never changes, whatever duplicates the lookup table holds.
+    """
+    index, positions = build_key_index(lookup, right_key)
+    rows = lookup_codes(df[left_key], index, positions)
+    for source, target in columns.items():
+        df[target] = take_column(lookup[source], rows)
+    return df
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Entity Resolution for Video Game Dataset Analysis
+This script proposes aliases that map publisher and developer names in the
+charts data onto the names used by the lookup tables. Candidates come from a
+character trigram index, so each name is only compared with lookup names that
+share rare trigrams with it. Proposals are written to a reviewable alias
+table that preprocessing applies through the enrichment key index.
+"""
+
+import os
+import re
+import argparse
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+ALIAS_DIR = 'data/aliases'
+
+# entity -> (charts column, lookup dataset, lookup key column)
+ENTITIES = {
+    'publisher': ('publisher', 'publishers', 'publisher'),
+    'developer': ('developer', 'developers', 'developer')
+}
+
+ALIAS_COLUMNS = ['alias', 'canonical', 'score', 'status']
+
+# Legal-entity suffixes, dropped only at the end of a name; multi-word forms
+# come first so "Co., Ltd." goes as a whole. Generic words such as "the",
+# "company" or a lone "co" are kept, as they can be part of the name itself
+COMPANY_SUFFIXES = [
+    'co ltd', 'co inc', 'pty ltd', 'inc', 'incorporated', 'ltd', 'limited', 'llc', 'llp',
+    'corp', 'corporation', 'gmbh', 'plc', 'kk', 'bv', 'srl'
+]
+
+# Review states of an alias; only approved aliases are applied. Names equal
+# after normalisation are marked auto, fuzzy matches pending, until reviewed
+ALIAS_STATUSES = ['approved', 'auto', 'pending', 'rejected']
+
+def alias_path(entity):
+    """Return the alias table path for an entity type."""
+    return os.path.join(ALIAS_DIR, f'{entity}_aliases.csv')
+
+def normalize_name(name):
+    """Lowercase a company name and drop punctuation and trailing legal-entity suffixes."""
+    text = ' '.join(re.sub(r'[^0-9a-z]+', ' ', str(name).lower()).split())
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in COMPANY_SUFFIXES:
+            if text.endswith(' ' + suffix):
+                text, stripped = text[:-len(suffix) - 1], True
+                break
+    return text
+
+def trigrams(text):
+    """Return the set of character trigrams of a normalised name, padded at the ends."""
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def dice(a, b):
+    """Dice similarity of two trigram sets."""
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+def build_trigram_index(names, max_postings=50):
+    """Build an inverted index from trigram to the lookup names containing it.
+
+    Trigrams shared by more than max_postings names (such as ' ga' in many
+    'games' studios) are dropped from the index; they would make the
+    candidate lists long without helping to tell names apart.
+    """
+    grams = {name: trigrams(normalize_name(name)) for name in names}
+    postings = defaultdict(list)
+    for name, name_grams in grams.items():
+        for gram in name_grams:
+            postings[gram].append(name)
+    index = {gram: hits for gram, hits in postings.items() if len(hits) <= max_postings}
+    return index, grams
+
+def best_match(name, index, grams, min_shared=2):
+    """Return (canonical, score) for the most similar lookup name, or (None, 0.0)."""
+    name_grams = trigrams(normalize_name(name))
+    shared = Counter()
+    for gram in name_grams:
+        shared.update(index.get(gram, ()))
+
+    best, best_score = None, 0.0
+    for candidate, count in shared.items():
+        if count < min_shared:
+            continue
+        score = dice(name_grams, grams[candidate])
+        if score > best_score or (score == best_score and best is not None and candidate < best):
+            best, best_score = candidate, score
+    return best, best_score
+
+def propose_aliases(names, lookup_names, threshold=0.75):
+    """Propose aliases for names that have no exact match in the lookup table.
+
+    Names equal to a lookup name after normalisation are marked auto and
+    fuzzy matches at or above the threshold pending; neither is applied
+    until a reviewer approves it.
+    """
+    lookup_names = sorted(set(lookup_names))
+    exact = set(lookup_names)
+    normalized = {}
+    for lookup_name in lookup_names:
+        normalized.setdefault(normalize_name(lookup_name), lookup_name)
+    index, grams = build_trigram_index(lookup_names)
+
+    rows = []
+    for name in sorted(set(names) - exact - {'Unknown'}):
+        canonical = normalized.get(normalize_name(name))
+        if canonical is not None:
+            rows.append({'alias': name, 'canonical': canonical, 'score': 1.0, 'status': 'auto'})
+            continue
+        canonical, score = best_match(name, index, grams)
+        if canonical is not None and score >= threshold:
+            rows.append({'alias': name, 'canonical': canonical, 'score': round(score, 3), 'status': 'pending'})
+    return pd.DataFrame(rows, columns=ALIAS_COLUMNS)
+
+def merge_with_reviewed(proposals, path):
+    """Keep existing review decisions and add only new proposals."""
+    if not os.path.exists(path):
+        return proposals
+    existing = pd.read_csv(path)
+    new = proposals[~proposals['alias'].isin(existing['alias'])]
+    return pd.concat([existing, new], ignore_index=True).sort_values('alias').reset_index(drop=True)
+
+def load_aliases(entity):
+    """Return {alias: canonical} for the approved aliases of an entity type."""
+    path = alias_path(entity)
+    if not os.path.exists(path):
+        return {}
+    table = pd.read_csv(path)
+    approved = table[table['status'] == 'approved']
+    return dict(zip(approved['alias'], approved['canonical']))
+
+def with_aliases(lookup, key, aliases):
+    """Return the lookup table with a copy of the canonical row under each alias.
+
+    The enrichment key index then resolves aliases with the same single hash
+    lookup per row as exact names, and the charts keep their original names.
+    """
+    existing = set(lookup[key])
+    aliases = {a: c for a, c in aliases.items() if a not in existing}
+    if not aliases:
+        return lookup
+    canonical = lookup.drop_duplicates(key).set_index(key, drop=False)
+    found = [a for a, c in aliases.items() if c in canonical.index]
+    extra = canonical.loc[[aliases[a] for a in found]].reset_index(drop=True)
+    extra[key] = found
+    return pd.concat([lookup, extra], ignore_index=True)
+
+def main(threshold=0.75):
+    """Propose aliases for publishers and developers and update the alias tables."""
+    from data_preprocessing import load_dataset, clean_charts_data, clean_developers, clean_publishers
+
+    print("=" * 60)
+    print("ENTITY RESOLUTION")
+    print("=" * 60)
+
+    charts = clean_charts_data(load_dataset('charts'))
+    lookups = {
+        'publishers': clean_publishers(load_dataset('publishers')),
+        'developers': clean_developers(load_dataset('developers'))
+    }
+    os.makedirs(ALIAS_DIR, exist_ok=True)
+
+    for entity, (column, dataset, key) in ENTITIES.items():
+        names = charts[column].unique()
+        lookup_names = lookups[dataset][key].unique()
+        unmatched = len(set(names) - set(lookup_names) - {'Unknown'})
+        proposals = propose_aliases(names, lookup_names, threshold)
+        table = merge_with_reviewed(proposals, alias_path(entity))
+        table.to_csv(alias_path(entity), index=False)
+
+        counts = table['status'].value_counts()
+        print(f"\n{entity.title()}s: {unmatched} names without an exact lookup match")
+        print(f"  ✓ {len(proposals)} proposed aliases written to {alias_path(entity)}")
+        print('  ' + ', '.join(f"{status}: {counts.get(status, 0)}" for status in ALIAS_STATUSES))
+
+    print("\nReview auto and pending rows and set their status to 'approved' or 'rejected'.")
+    print("Approved aliases are applied by data_preprocessing.py on the next run.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Propose publisher/developer aliases.")
+    parser.add_argument('--threshold', type=float, default=0.75,
+                        help="minimum trigram Dice similarity for a fuzzy match (default: 0.75)")
+    args = parser.parse_args()
+    main(threshold=args.threshold)
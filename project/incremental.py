@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Incremental Preprocessing for Video Game Dataset Analysis
+This module patches the processed datasets using a last_update watermark
+and content hashes of the raw inputs, instead of rebuilding them. Only the
+charts partitions holding changed rows are rewritten, and unchanged rows keep
+their row ids.
+"""
+
+import os
+import json
+import hashlib
+import pandas as pd
+import numpy as np
+
+from cleaning import clean_text_categories
+from data_preprocessing import (
+    DATASET_FILES, CHARTS_PARTITION_COLS, load_dataset, clean_charts_data,
+    clean_developers, clean_publishers, merge_datasets,
+    save_table, build_summary_stats, save_summary_stats
+)
+from subsets import SUBSETS, select_row_ids, save_subset
+from sampling import SAMPLE_TABLE, build_stratified_sample, save_sample
+from metrics import build_metrics, save_metrics
+from validation import validate, save_validation_report
+from entity_resolution import ENTITIES, alias_path
+from storage import load_manifest, load_row_ids, read_table, rewrite_partitions, write_manifest
+
+STATE_FILE = 'processed_data/incremental_state.json'
+STATE_VERSION = 1
+
+# Columns that identify a game row; rows sharing a key are reprocessed together
+KEY_COLUMNS = ['img', 'title', 'platform']
+
+def file_hash(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def input_hashes():
+    """Hash every raw input file and every alias table that exists."""
+    hashes = {name: file_hash(path) for name, path in DATASET_FILES.items()}
+    for entity in ENTITIES:
+        if os.path.exists(alias_path(entity)):
+            hashes[f'{entity}_aliases'] = file_hash(alias_path(entity))
+    return hashes
+
+def compute_watermark(charts):
+    """Return the newest last_update in the raw charts data as an ISO date."""
+    latest = pd.to_datetime(charts['last_update'], format='%Y-%m-%d', errors='coerce').max()
+    return None if pd.isna(latest) else latest.strftime('%Y-%m-%d')
+
+def load_state():
+    """Load the incremental state, or None if there is no usable state."""
+    if not os.path.exists(STATE_FILE):
+        return None
+    with open(STATE_FILE) as f:
+        state = json.load(f)
+    if state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+def save_state(watermark, hashes):
+    """Record the watermark and input hashes of the data just processed."""
+    state = {
+        'version': STATE_VERSION,
+        'watermark': watermark,
+        'input_hashes': hashes
+    }
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2)
+    return state
+
+def row_keys(df):
+    """Hash the key columns of raw or cleaned charts rows into uint64 keys.
+
+    Text is normalised the same way clean_charts_data does, so a raw row and
+    its cleaned counterpart get the same key.
+    """
+    keys = pd.DataFrame({col: clean_text_categories(df[col]) for col in KEY_COLUMNS})
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def changed_lookup_keys(old, new, key):
+    """Return the set of lookup keys whose rows were added, removed or edited."""
+    diff = old.merge(new, how='outer', indicator=True)
+    return set(diff.loc[diff['_merge'] != 'both', key])
+
+def assign_row_ids(old_rows, new_rows, next_id):
+    """Give re-merged rows the row ids their keys had, and rows with new keys ids from next_id.
+
+    Rows sharing a key take that key's old ids in order; any beyond them count as new.
+    """
+    old = pd.DataFrame({'key': row_keys(old_rows), 'row_id': old_rows['row_id'].to_numpy()})
+    old = old.sort_values('row_id', kind='stable')
+    old['n'] = old.groupby('key').cumcount()
+    new = pd.DataFrame({'key': row_keys(new_rows)})
+    new['n'] = new.groupby('key').cumcount()
+    ids = new.merge(old, on=['key', 'n'], how='left')['row_id'].to_numpy(dtype=np.float64)
+    missing = np.isnan(ids)
+    ids[missing] = next_id + np.arange(missing.sum())
+    return ids.astype(np.int64)
+
+def patch_subsets(entries, dropped_ids, new_rows):
+    """Update each subset's row ids with the dropped and re-merged rows only.
+
+    Subsets are row predicates, so rows that did not change keep their
+    membership. Returns the patched row ids per subset.
+    """
+    analysis_datasets = {}
+    for name, (_, predicate) in SUBSETS.items():
+        row_ids = load_row_ids(entries[name]['subset'])
+        row_ids = np.union1d(row_ids[~np.isin(row_ids, dropped_ids)], select_row_ids(new_rows, predicate))
+        analysis_datasets[name] = row_ids
+    return analysis_datasets
+
+def patch_frame(df, drop, new_rows):
+    """Drop the rows flagged in the drop mask and append the replacement rows."""
+    kept = df[~drop]
+    if len(new_rows) == 0:
+        return kept
+    return pd.concat([kept, new_rows], ignore_index=True)
+
+def run_incremental():
+    """Patch the processed datasets with changes since the last run.
+
+    Returns False when there is no usable state and a full rebuild is needed.
+    """
+    state = load_state()
+    if state is None:
+        print("No incremental state found; a full rebuild is required.")
+        return False
+
+    hashes = input_hashes()
+    changed_inputs = [name for name in sorted(set(hashes) | set(state['input_hashes']))
+                      if hashes.get(name) != state['input_hashes'].get(name)]
+    if not changed_inputs:
+        print("✓ Inputs unchanged since last run; nothing to do")
+        return True
+    print(f"Changed inputs: {', '.join(changed_inputs)}")
+
+    manifest = load_manifest()
+    if manifest is None:
+        print("No processed data manifest found; a full rebuild is required.")
+        return False
+    entries = manifest['tables']
+    charts = read_table('charts', manifest=manifest)
+    clean_columns = entries['charts_clean']['columns']
+    others = {
+        name: read_table(f'{name}_clean', manifest=manifest)
+        for name in ['developers', 'publishers', 'geo_cities', 'geo_countries']
+    }
+
+    # Work out which lookup keys changed so only their games are re-merged
+    affected_developers, affected_publishers = set(), set()
+    if 'developers' in changed_inputs:
+        new_dev = clean_developers(load_dataset('developers'))
+        affected_developers = changed_lookup_keys(others['developers'], new_dev, 'developer')
+        others['developers'] = new_dev
+    if 'publishers' in changed_inputs:
+        new_pub = clean_publishers(load_dataset('publishers'))
+        affected_publishers = changed_lookup_keys(others['publishers'], new_pub, 'publisher')
+        others['publishers'] = new_pub
+    if 'geo_countries' in changed_inputs:
+        new_geo = load_dataset('geo_countries')
+        countries = changed_lookup_keys(others['geo_countries'], new_geo, 'Country')
+        countries = {str(c).strip().replace('"', '') for c in countries}
+        pub = others['publishers']
+        affected_publishers |= set(pub.loc[pub['country'].isin(countries), 'publisher'])
+        others['geo_countries'] = new_geo
+    if 'geo_cities' in changed_inputs:
+        others['geo_cities'] = load_dataset('geo_cities')
+    # An alias edit can only affect names without an exact lookup match
+    if 'developer_aliases' in changed_inputs:
+        affected_developers |= set(charts['developer']) - set(others['developers']['developer'])
+    if 'publisher_aliases' in changed_inputs:
+        affected_publishers |= set(charts['publisher']) - set(others['publishers']['publisher'])
+    for name in ['developers', 'publishers', 'geo_cities', 'geo_countries']:
+        if name in changed_inputs:
+            entries[f'{name}_clean'] = save_table(others[name], f'{name}_clean')
+
+    def lookup_changed(df):
+        return (df['developer'].isin(affected_developers).to_numpy() |
+                df['publisher'].isin(affected_publishers).to_numpy())
+
+    # Re-clean only charts rows that are new, removed or newer than the watermark
+    changed_keys = np.array([], dtype=np.uint64)
+    recleaned = charts.iloc[:0][clean_columns]
+    watermark = state['watermark']
+    if 'charts' in changed_inputs:
+        charts_raw = load_dataset('charts')
+        raw_keys = row_keys(charts_raw)
+        stored_keys = row_keys(charts)
+        updated = pd.to_datetime(charts_raw['last_update'], format='%Y-%m-%d', errors='coerce')
+        if watermark:
+            newer = (updated > pd.Timestamp(watermark)).to_numpy()
+        else:
+            newer = np.ones(len(charts_raw), dtype=bool)
+        added = ~np.isin(raw_keys, stored_keys)
+        removed = stored_keys[~np.isin(stored_keys, raw_keys)]
+        changed_keys = np.union1d(raw_keys[newer | added], removed)
+
+        recleaned = clean_charts_data(charts_raw[np.isin(raw_keys, changed_keys)])
+        watermark = compute_watermark(charts_raw)
+        print(f"  ✓ Re-cleaned {len(recleaned)} rows ({len(changed_keys)} changed keys)")
+
+    # Re-merge re-cleaned rows plus stored rows whose publisher/developer changed
+    stored_changed = np.isin(row_keys(charts), changed_keys)
+    drop = stored_changed | lookup_changed(charts)
+    remerge = pd.concat([recleaned, charts.loc[drop & ~stored_changed, clean_columns]], ignore_index=True)
+    if not drop.any() and len(remerge) == 0:
+        analysis_datasets = {name: load_row_ids(entries[name]['subset']) for name in SUBSETS}
+    else:
+        merged_rows = merge_datasets(remerge, others)
+        next_id = int(charts['row_id'].max()) + 1 if len(charts) else 0
+        merged_rows['row_id'] = assign_row_ids(charts.loc[drop], merged_rows, next_id)
+        touched = pd.concat([charts.loc[drop, CHARTS_PARTITION_COLS], merged_rows[CHARTS_PARTITION_COLS]])
+        dropped_ids = charts.loc[drop, 'row_id'].to_numpy()
+        charts = patch_frame(charts, drop, merged_rows)
+        entries['charts'] = rewrite_partitions(charts, 'charts', entries['charts'], touched)
+        entries[SAMPLE_TABLE] = save_sample(build_stratified_sample(charts))
+        print(f"  ✓ Re-merged {len(merged_rows)} rows, rewrote {touched.drop_duplicates().shape[0]} "
+              f"of {len(entries['charts']['files'])} partitions")
+        save_validation_report(validate(charts))
+
+        # Bitmaps span row ids up to the largest, which may now exceed the row count
+        analysis_datasets = patch_subsets(entries, dropped_ids, merged_rows)
+        base_rows = int(charts['row_id'].max()) + 1 if len(charts) else 0
+        for name, row_ids in analysis_datasets.items():
+            entries[name] = save_subset(name, row_ids, base_rows)
+
+    manifest = write_manifest(entries)
+    summary_stats = build_summary_stats(charts[clean_columns], charts, analysis_datasets)
+    save_summary_stats(summary_stats)
+    save_metrics(build_metrics(charts, summary_stats), manifest['snapshot'])
+    print("  ✓ Patched processed datasets, summary statistics and metrics")
+
+    save_state(watermark, hashes)
+    print(f"  ✓ Watermark is now {watermark}")
+    return True
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Load Test for Video Game Dataset Analysis
+This script replays dashboard callback requests against a dashboard running
+on localhost at a chosen concurrency, and reports per-callback latency
+percentiles, throughput and the server's CPU and memory use.
+
+Payloads come either from real sessions, recorded by starting the dashboard
+with VG_RECORD_CALLBACKS=<file>, or are generated from the running app's
+callback graph and filter options.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import uuid
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+PAYLOAD_FILE = 'processed_data/callback_payloads.jsonl'
+RESULTS_FILE = 'reports/loadtest.json'
+CALLBACK_PATH = '/_dash-update-component'
+
+# Stores holding the numbered filter request; the first is written by the browser
+REQUEST_STORES = ('filter-request', 'exact-request')
+
+DEFAULT_URL = 'http://127.0.0.1:8050'
+PERCENTILES = [50, 95, 99]
+
+# Seconds between server CPU/RSS samples
+SAMPLE_INTERVAL = 0.5
+
+def install_recorder(app, path):
+    """Append the body of every callback request the app receives to a JSON lines file."""
+    from flask import request
+    lock = threading.Lock()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    @app.server.before_request
+    def record_callback():
+        if request.path.endswith(CALLBACK_PATH):
+            body = request.get_json(silent=True)
+            if body is not None:
+                with lock, open(path, 'a') as f:
+                    f.write(json.dumps(body) + '\n')
+
+def load_payloads(path):
+    """Read recorded or generated callback payloads."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def save_payloads(payloads, path):
+    """Write callback payloads as JSON lines."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        for payload in payloads:
+            f.write(json.dumps(payload) + '\n')
+
+def _parse_outputs(output):
+    """Split a callback output string such as '..a.children...b.figure..' into id/property pairs."""
+    parts = output[2:-2].split('...') if output.startswith('..') else [output]
+    return [dict(zip(('id', 'property'), part.rsplit('.', 1))) for part in parts]
+
+def _find_components(node, found):
+    """Collect the props of every component with an id in a serialized layout."""
+    if isinstance(node, dict):
+        props = node.get('props', {})
+        if isinstance(props.get('id'), str):
+            found[props['id']] = props
+        for value in props.values():
+            _find_components(value, found)
+    elif isinstance(node, list):
+        for item in node:
+            _find_components(item, found)
+    return found
+
+def _random_value(props, rng):
+    """Pick a value a user could set on a dropdown or range slider."""
+    if 'options' in props:
+        return rng.choice([option['value'] if isinstance(option, dict) else option
+                           for option in props['options']])
+    low, high = sorted(rng.randint(props['min'], props['max']) for _ in range(2))
+    return [low, high]
+
+def _filter_request(filter_values, generation):
+    """The numbered filter request the dashboard's browser code stores for the server."""
+    return {'session': 'loadtest', 'generation': generation, 'filters': filter_values}
+
+def _as_client(payload, client, generation):
+    """Copy a payload so its filter requests come from one client's own session, in order.
+
+    Each client then behaves like one user: none of its requests is
+    overtaken by another client's and dropped as stale. client should be
+    unique per run as well, since the server remembers sessions' generations
+    across runs and restarts.
+    """
+    payload = json.loads(json.dumps(payload))
+    for item in payload['inputs']:
+        value = item.get('value')
+        if isinstance(value, dict) and 'session' in value and 'generation' in value:
+            value['session'] = f"{value['session']}-{client}"
+            value['generation'] = generation
+    return payload
+
+def generate_payloads(url=DEFAULT_URL, count=200, seed=0):
+    """Build filter-change payloads from the running app's callbacks and layout.
+
+    Every payload changes one filter at random. The browser-side callback
+    that numbers filter changes cannot run here, so callbacks fed by the
+    filter-request or exact-request stores are sent the request it would
+    have stored.
+    """
+    import requests
+    session = requests.Session()
+    dependencies = session.get(f'{url}/_dash-dependencies').json()
+    components = _find_components(session.get(f'{url}/_dash-layout').json(), {})
+    rng = random.Random(seed)
+
+    # The filters, in the order the browser-side callback stores them in a request
+    numbering = next(dep for dep in dependencies if dep['output'] == f'{REQUEST_STORES[0]}.data')
+    filter_ids = [i['id'] for i in numbering['inputs']]
+    filter_inputs = {(i['id'], i['property']) for i in numbering['inputs']}
+    # Dropdowns such as the title search get their options while the user types, so they stay unset
+    changeable = [cid for cid in filter_ids if components[cid].get('options') or 'min' in components[cid]]
+    callbacks = [dep for dep in dependencies
+                 if dep['inputs'] and not dep.get('clientside_function')
+                 and all(i['id'] in components for i in dep['inputs'])
+                 and any((i['id'], i['property']) in filter_inputs or i['id'] in REQUEST_STORES
+                         for i in dep['inputs'])]
+    values = {cid: components[cid].get('value') for cid in filter_ids}
+
+    payloads = []
+    for _ in range(count):
+        changed = rng.choice(changeable)
+        values[changed] = _random_value(components[changed], rng)
+        for dep in callbacks:
+            inputs = []
+            for item in dep['inputs']:
+                value = values.get(item['id'])
+                if item['id'] in REQUEST_STORES:
+                    value = _filter_request([values[cid] for cid in filter_ids], len(payloads) + 1)
+                inputs.append({**item, 'value': value})
+            trigger = changed if any(i['id'] == changed for i in dep['inputs']) else dep['inputs'][0]['id']
+            payloads.append({
+                'output': dep['output'],
+                'outputs': _parse_outputs(dep['output']),
+                'inputs': inputs,
+                'changedPropIds': [f"{trigger}.{next(i['property'] for i in dep['inputs'] if i['id'] == trigger)}"],
+                'state': []
+            })
+    return payloads
+
+def callback_name(payload):
+    """A short label for the callback a payload targets."""
+    outputs = _parse_outputs(payload['output'])
+    first = f"{outputs[0]['id']}.{outputs[0]['property'].split('@')[0]}"
+    return first if len(outputs) == 1 else f"{first} +{len(outputs) - 1}"
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))]
+
+def _server_processes(port, pid=None):
+    """Find the server process (by pid, or by the port it listens on) and its children."""
+    import psutil
+    if pid is None:
+        pids = [c.pid for c in psutil.net_connections(kind='tcp')
+                if c.laddr and c.laddr.port == port and c.status == psutil.CONN_LISTEN and c.pid]
+        if not pids:
+            return []
+        pid = pids[0]
+    process = psutil.Process(pid)
+    return [process] + process.children(recursive=True)
+
+class ResourceSampler:
+    """Samples the server's CPU and RSS in a background thread."""
+
+    def __init__(self, processes, interval=SAMPLE_INTERVAL):
+        self.processes = processes
+        self.interval = interval
+        self.cpu, self.rss = [], []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self):
+        """Record CPU and RSS summed over the server processes."""
+        cpu = rss = 0
+        for process in self.processes:
+            try:
+                cpu += process.cpu_percent(None)
+                rss += process.memory_info().rss
+            except Exception:
+                continue
+        self.cpu.append(cpu)
+        self.rss.append(rss)
+
+    def _run(self):
+        for process in self.processes:
+            process.cpu_percent(None)
+        while not self._stop.wait(self.interval):
+            self._sample()
+        # A last sample covers the tail of the run, and runs shorter than one interval
+        self._sample()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self):
+        """Mean and peak CPU percent and peak RSS in MB, or None if no server process was found."""
+        if not self.processes:
+            return None
+        return {'cpu_mean_pct': sum(self.cpu) / len(self.cpu), 'cpu_max_pct': max(self.cpu),
+                'rss_max_mb': max(self.rss) / 1024**2}
+
+def replay(payloads, url=DEFAULT_URL, concurrency=4, duration=30.0, requests_total=None, timeout=60.0):
+    """Send payloads in a loop from concurrent clients; return (name, seconds, outcome) per request.
+
+    The outcome is 'ok', 'dropped' (HTTP 204: the server dropped the
+    request as stale or left every output unchanged) or 'error'. Each client
+    starts at a different offset in the payload list, sends its filter
+    requests as its own session for this run, and runs until the duration
+    has passed or the shared request budget is spent.
+    """
+    import requests
+    run_id = uuid.uuid4().hex[:8]
+    results = []
+    lock = threading.Lock()
+    sent = [0]
+    deadline = time.perf_counter() + duration
+
+    def client(worker):
+        session = requests.Session()
+        i = worker * len(payloads) // concurrency
+        while time.perf_counter() < deadline:
+            with lock:
+                if requests_total is not None and sent[0] >= requests_total:
+                    return
+                sent[0] += 1
+            payload = _as_client(payloads[i % len(payloads)], f'{run_id}-{worker}', i)
+            i += 1
+            start = time.perf_counter()
+            try:
+                status = session.post(url + CALLBACK_PATH, json=payload, timeout=timeout).status_code
+                outcome = {200: 'ok', 204: 'dropped'}.get(status, 'error')
+            except requests.RequestException:
+                outcome = 'error'
+            with lock:
+                results.append((callback_name(payload), time.perf_counter() - start, outcome))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for worker in range(concurrency):
+            pool.submit(client, worker)
+    return results
+
+def summarize(results, elapsed):
+    """Per-callback request counts, errors, drops and latency percentiles in milliseconds.
+
+    Latencies cover answered requests only; dropped requests return at once
+    and would make the callback look fast.
+    """
+    by_callback = defaultdict(list)
+    for name, seconds, outcome in results:
+        by_callback[name].append((seconds, outcome))
+    summary = {}
+    for name, rows in sorted(by_callback.items()):
+        latencies = [seconds * 1000 for seconds, outcome in rows if outcome == 'ok']
+        summary[name] = {
+            'requests': len(rows),
+            'errors': sum(outcome == 'error' for _, outcome in rows),
+            'dropped': sum(outcome == 'dropped' for _, outcome in rows),
+            'mean_ms': sum(latencies) / len(latencies) if latencies else None,
+            **{f'p{p}_ms': percentile(latencies, p) if latencies else None for p in PERCENTILES}
+        }
+    return {'elapsed_s': elapsed, 'requests': len(results),
+            'throughput_rps': len(results) / elapsed if elapsed else 0.0, 'callbacks': summary}
+
+def print_summary(report):
+    """Print the load test results as a table."""
+    def ms(value):
+        return f"{value:>9.1f}" if value is not None else f"{'-':>9}"
+
+    print(f"\n{'Callback':<36}{'Requests':>9}{'Errors':>8}{'Dropped':>9}{'Mean':>9}"
+          + ''.join(f"{f'p{p}':>9}" for p in PERCENTILES) + "  (ms)")
+    for name, stats in report['callbacks'].items():
+        print(f"{name:<36}{stats['requests']:>9,}{stats['errors']:>8,}{stats['dropped']:>9,}{ms(stats['mean_ms'])}"
+              + ''.join(ms(stats[f'p{p}_ms']) for p in PERCENTILES))
+    print(f"\n{report['requests']:,} requests in {report['elapsed_s']:.1f}s at concurrency "
+          f"{report['concurrency']}: {report['throughput_rps']:.1f} requests/s")
+    server = report.get('server')
+    if server:
+        print(f"Server CPU: {server['cpu_mean_pct']:.0f}% mean, {server['cpu_max_pct']:.0f}% peak; "
+              f"RSS peak {server['rss_max_mb']:.0f} MB")
+    else:
+        print("⚠ Server process not found; CPU and RSS were not sampled")
+
+def launch_server(port, startup_timeout=120.0):
+    """Start the dashboard on localhost in a subprocess and wait until it answers."""
+    import requests
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli.py')
+    server = subprocess.Popen([sys.executable, cli, 'serve', '--port', str(port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.perf_counter() + startup_timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"dashboard exited with code {server.returncode} during start-up")
+        try:
+            requests.get(f'http://127.0.0.1:{port}/', timeout=1)
+            return server
+        except requests.RequestException:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError(f"dashboard did not answer on port {port} within {startup_timeout:.0f}s")
+
+def run(args):
+    """Generate or load payloads, replay them and report."""
+    server = launch_server(args.port) if args.launch else None
+    url = f'http://127.0.0.1:{args.port}'
+    try:
+        if args.generate or not os.path.exists(args.payloads):
+            payloads = generate_payloads(url, args.generate or 200, args.seed)
+            save_payloads(payloads, args.payloads)
+            print(f"✓ Generated {len(payloads):,} payloads into {args.payloads}")
+        else:
+            payloads = load_payloads(args.payloads)
+            print(f"✓ Loaded {len(payloads):,} payloads from {args.payloads}")
+
+        processes = _server_processes(args.port, server.pid if server else None)
+        start = time.perf_counter()
+        with ResourceSampler(processes) as sampler:
+            results = replay(payloads, url, args.concurrency, args.duration, args.requests)
+        report = summarize(results, time.perf_counter() - start)
+        report.update(concurrency=args.concurrency, server=sampler.summary())
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print_summary(report)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Results written to {args.output}")
+
+    errors = sum(stats['errors'] for stats in report['callbacks'].values())
+    # Every client sends its requests in order as its own session, so none should be dropped
+    dropped = sum(stats['dropped'] for stats in report['callbacks'].values())
+    slow = [name for name, stats in report['callbacks'].items()
+            if args.max_p95 is not None and stats['p95_ms'] is not None and stats['p95_ms'] > args.max_p95]
+    if errors or dropped or slow:
+        for name in slow:
+            print(f"⚠ {name}: p95 {report['callbacks'][name]['p95_ms']:.1f} ms exceeds {args.max_p95:.1f} ms")
+        if errors:
+            print(f"⚠ {errors:,} requests failed")
+        if dropped:
+            print(f"⚠ {dropped:,} requests were dropped (HTTP 204) and are left out of the latencies")
+        sys.exit(1)
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Replay dashboard callbacks against a local server.")
+    parser.add_argument('--payloads', default=PAYLOAD_FILE,
+                        help=f"recorded payloads; generated if missing (default: {PAYLOAD_FILE})")
+    parser.add_argument('--generate', type=int, metavar='N',
+                        help="generate N filter changes from the running app, overwriting --payloads")
+    parser.add_argument('--seed', type=int, default=0, help="seed for generated filter changes (default: 0)")
+    parser.add_argument('--port', type=int, default=8050, help="dashboard port on 127.0.0.1 (default: 8050)")
+    parser.add_argument('--launch', action='store_true', help="start the dashboard for the test and stop it after")
+    parser.add_argument('--concurrency', type=int, default=4, help="concurrent clients (default: 4)")
+    parser.add_argument('--duration', type=float, default=30.0, help="seconds to run (default: 30)")
+    parser.add_argument('--requests', type=int, help="stop after this many requests")
+    parser.add_argument('--max-p95', type=float, metavar='MS',
+                        help="exit non-zero if any callback's p95 latency exceeds this")
+    parser.add_argument('--output', default=RESULTS_FILE, help=f"JSON results (default: {RESULTS_FILE})")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -9,26 +9,65 @@ import sys
 import pandas as pd
 import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import dash
 from dash import dcc, html, Input, Output, State, dash_table
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
-import pickle
+
+from backends import get_backend
+from storage import load_manifest, read_table
+from subsets import SubsetView
+from topk import TopKIndex
+from title_search import TitleIndex
+from render_budget import apply_render_budget
+from coalescing import RequestGenerations
+from result_cache import ResultCache
+from sampling import (SAMPLE_TABLE, SAMPLE_COLUMNS, filter_sample, estimate_totals,
+                      estimate_means)
 
 # Add user site-packages to path
 import site
 sys.path.append(site.getusersitepackages())
 
+# Columns the dashboard reads from the processed charts table
+DASHBOARD_COLUMNS = ['title', 'platform', 'genre', 'publisher', 'year', 'critic_score',
+                     'total_sales', 'na_sales', 'jp_sales', 'pal_sales', 'other_sales']
+
+# Above this many games the dashboard answers from the stratified sample
+# first and replaces the estimates with exact results when they are ready
+APPROX_MIN_ROWS = int(os.environ.get('VG_APPROX_MIN_ROWS', 500_000))
+
+REGION_COLUMNS = ['na_sales', 'jp_sales', 'pal_sales', 'other_sales']
+REGION_NAMES = ['North America', 'Japan', 'PAL Region', 'Other Regions']
+
+# Year slider changes are held this long in the browser, and only the last is sent
+SLIDER_DEBOUNCE_MS = 300
+
 # Load processed data
 def load_data():
     """Load all processed datasets."""
     data = {}
     try:
-        data['charts'] = pd.read_pickle('processed_data/charts_merged.pkl')
-        data['recent'] = pd.read_pickle('processed_data/recent_games.pkl')
-        data['major_publishers'] = pd.read_pickle('processed_data/major_publishers.pkl')
-        data['top_platforms'] = pd.read_pickle('processed_data/top_platforms.pkl')
+        manifest = load_manifest()
+        if manifest is None:
+            # Processed data written before the Parquet layout
+            data['charts'] = pd.read_pickle('processed_data/charts_merged.pkl')
+            data['recent'] = pd.read_pickle('processed_data/recent_games.pkl')
+            data['major_publishers'] = pd.read_pickle('processed_data/major_publishers.pkl')
+            data['top_platforms'] = pd.read_pickle('processed_data/top_platforms.pkl')
+            data['sample'] = None
+            data['snapshot'] = f"pickle-{os.stat('processed_data/charts_merged.pkl').st_mtime_ns}"
+        else:
+            data['charts'] = read_table('charts', columns=DASHBOARD_COLUMNS, manifest=manifest)
+            # Subsets are lazy views; call .to_frame(columns) to read their rows
+            data['recent'] = SubsetView('recent_games', manifest)
+            data['major_publishers'] = SubsetView('major_publishers', manifest)
+            data['top_platforms'] = SubsetView('top_platforms', manifest)
+            data['sample'] = None
+            data['snapshot'] = manifest['snapshot']
+            if SAMPLE_TABLE in manifest['tables'] and manifest['tables']['charts']['rows'] >= APPROX_MIN_ROWS:
+                data['sample'] = read_table(SAMPLE_TABLE, columns=DASHBOARD_COLUMNS + SAMPLE_COLUMNS,
+                                            manifest=manifest)
         print("✓ Data loaded successfully")
         return data
     except Exception as e:
@@ -39,12 +78,35 @@ def load_data():
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 app.title = "Video Game Industry Dashboard"
 
+# VG_RECORD_CALLBACKS=<file> records every callback request for replay by loadtest.py
+if os.environ.get('VG_RECORD_CALLBACKS'):
+    from loadtest import install_recorder
+    install_recorder(app, os.environ['VG_RECORD_CALLBACKS'])
+
+# VG_PROFILING=1 (or a VG_PROFILE_RATE sampling rate) profiles callbacks on request; see /_profiles
+if os.environ.get('VG_PROFILING') or float(os.environ.get('VG_PROFILE_RATE', 0)):
+    from request_profiling import install_profiling
+    install_profiling(app)
+
 # Load data
 data = load_data()
 if data is None:
     print("Failed to load data. Please run data preprocessing first.")
     sys.exit(1)
 
+# Aggregations run on the backend chosen by VG_BACKEND (pandas, polars or duckdb)
+backend = get_backend()
+charts_frame = backend.from_pandas(data['charts'])
+
+# The top games table merges rows presorted per (platform, genre) cell
+top_games_index = TopKIndex(data['charts'])
+
+# Title search answers from a trigram and prefix index built once here
+title_index = TitleIndex(data['charts'])
+
+# Dashboard results are cached on disk per data snapshot and shared by all worker processes
+result_cache = ResultCache(data['snapshot'], namespace=backend.name)
+
 # Define color schemes
 colors = {
     'primary': '#1f77b4',
@@ -58,37 +120,56 @@ colors = {
 }
 
 # Helper functions for creating visualizations
+def mark_approximate(fig):
+    """Label a figure as a sample estimate."""
+    fig.update_layout(title_text=f"{fig.layout.title.text} (≈ sample estimate, 95% CI)")
+    return fig
+
 def create_sales_by_region_chart(df):
     """Create regional sales distribution chart."""
-    regional_sales = df[['na_sales', 'jp_sales', 'pal_sales', 'other_sales']].sum()
-    
+    regional_sales = backend.column_sums(df, REGION_COLUMNS)
+    return plot_sales_by_region(regional_sales.values)
+
+def plot_sales_by_region(regional_sales, errors=None):
+    """Plot regional sales, with interval half-widths in the hover text if given."""
     fig = px.pie(
-        values=regional_sales.values,
-        names=['North America', 'Japan', 'PAL Region', 'Other Regions'],
+        values=regional_sales,
+        names=REGION_NAMES,
         title="Sales Distribution by Region",
         color_discrete_sequence=px.colors.qualitative.Set3
     )
     
     fig.update_traces(textposition='inside', textinfo='percent+label')
+    if errors is not None:
+        fig.update_traces(customdata=np.asarray(errors),
+                          hovertemplate='%{label}: %{value:.1f}M ± %{customdata:.1f}M<extra></extra>')
     fig.update_layout(
         font_size=12,
         showlegend=True,
         height=400
     )
     
-    return fig
+    return apply_render_budget(fig, 'regional-sales-chart')
 
 def create_platform_sales_chart(df):
     """Create platform sales comparison chart."""
-    platform_sales = df.groupby('platform')['total_sales'].sum().sort_values(ascending=False).head(15)
-    
+    platform_sales = backend.group_agg(
+        df, ['platform'], {'total_sales': ('total_sales', 'sum')}, sort_by='total_sales', limit=15
+    ).set_index('platform')['total_sales']
+    return plot_platform_sales(platform_sales)
+
+def plot_platform_sales(platform_sales, errors=None):
+    """Plot total sales per platform, with error bars if given."""
+    # Pass a frame: px.bar rejects empty x and y arrays when no games match the filters
     fig = px.bar(
-        x=platform_sales.values,
-        y=platform_sales.index,
+        pd.DataFrame({'sales': platform_sales.to_numpy(), 'platform': platform_sales.index.to_numpy()}),
+        x='sales',
+        y='platform',
+        error_x=errors,
         orientation='h',
         title="Top 15 Platforms by Total Sales",
-        labels={'x': 'Total Sales (Millions)', 'y': 'Platform'},
-        color=platform_sales.values,
+        labels={'sales': 'Total Sales (Millions)', 'platform': 'Platform'},
+        color='sales',
         color_continuous_scale='viridis'
     )
     
@@ -98,21 +179,27 @@ def create_platform_sales_chart(df):
         font_size=12
     )
     
-    return fig
+    return apply_render_budget(fig, 'platform-sales-chart')
 
 def create_genre_trend_chart(df):
     """Create genre popularity over time chart."""
     # Get top 5 genres by total sales
-    top_genres = df.groupby('genre')['total_sales'].sum().sort_values(ascending=False).head(5).index
+    top_genres = backend.group_agg(
+        df, ['genre'], {'total_sales': ('total_sales', 'sum')}, sort_by='total_sales', limit=5
+    )['genre'].tolist()
     
     # Filter data for top genres and recent years
-    genre_data = df[df['genre'].isin(top_genres) & (df['year'] >= 2000)]
-    yearly_genre_sales = genre_data.groupby(['year', 'genre'])['total_sales'].sum().reset_index()
-    
+    genre_data = backend.filter_rows(df, isin={'genre': top_genres}, ranges={'year': (2000, None)})
+    yearly_genre_sales = backend.group_agg(genre_data, ['year', 'genre'], {'total_sales': ('total_sales', 'sum')})
+    return plot_genre_trend(yearly_genre_sales)
+
+def plot_genre_trend(yearly_genre_sales, errors=None):
+    """Plot yearly sales of the top genres; errors names a column of half-widths."""
     fig = px.line(
         yearly_genre_sales,
         x='year',
         y='total_sales',
+        error_y=errors,
         color='genre',
         title="Top 5 Genres Sales Trend (2000-2024)",
         labels={'total_sales': 'Total Sales (Millions)', 'year': 'Year'},
@@ -125,16 +212,20 @@ def create_genre_trend_chart(df):
         hovermode='x unified'
     )
     
-    return fig
+    return apply_render_budget(fig, 'genre-trend-chart')
 
 def create_publisher_analysis_chart(df):
     """Create publisher success analysis chart."""
-    publisher_stats = df.groupby('publisher').agg({
-        'total_sales': ['sum', 'mean', 'count'],
-        'critic_score': 'mean'
-    }).round(2)
-    
-    publisher_stats.columns = ['total_sales_sum', 'avg_sales_per_game', 'game_count', 'avg_critic_score']
+    publisher_stats = backend.group_agg(df, ['publisher'], {
+        'total_sales_sum': ('total_sales', 'sum'),
+        'avg_sales_per_game': ('total_sales', 'mean'),
+        'game_count': ('total_sales', 'count'),
+        'avg_critic_score': ('critic_score', 'mean')
+    }).set_index('publisher').round(2)
+    return plot_publisher_analysis(publisher_stats)
+
+def plot_publisher_analysis(publisher_stats, errors=None):
+    """Plot the top publishers by sales; errors names a column of half-widths."""
     publisher_stats = publisher_stats[publisher_stats['game_count'] >= 10]  # Publishers with at least 10 games
     publisher_stats = publisher_stats.sort_values('total_sales_sum', ascending=False).head(15)
     
@@ -142,6 +233,7 @@ def create_publisher_analysis_chart(df):
         publisher_stats,
         x='game_count',
         y='avg_sales_per_game',
+        error_y=errors,
         size='total_sales_sum',
         color='avg_critic_score',
         hover_data=['total_sales_sum'],
@@ -159,17 +251,22 @@ def create_publisher_analysis_chart(df):
         font_size=12
     )
     
-    return fig
+    return apply_render_budget(fig, 'publisher-analysis-chart')
 
 def create_yearly_sales_chart(df):
     """Create yearly sales trend chart."""
-    yearly_sales = df.groupby('year')['total_sales'].sum().reset_index()
+    yearly_sales = backend.group_agg(df, ['year'], {'total_sales': ('total_sales', 'sum')})
+    return plot_yearly_sales(yearly_sales)
+
+def plot_yearly_sales(yearly_sales, errors=None):
+    """Plot total sales per year; errors names a column of half-widths."""
     yearly_sales = yearly_sales[yearly_sales['year'] >= 1980]  # Focus on modern era
     
     fig = px.line(
         yearly_sales,
         x='year',
         y='total_sales',
+        error_y=errors,
         title="Video Game Industry Sales Trend (1980-2024)",
         labels={'total_sales': 'Total Sales (Millions)', 'year': 'Year'},
         color_discrete_sequence=[colors['primary']]
@@ -190,12 +287,16 @@ def create_yearly_sales_chart(df):
         name='Trend'
     )
     
-    return fig
+    return apply_render_budget(fig, 'yearly-sales-chart')
 
-def create_top_games_table(df, n=20):
-    """Create top games data table."""
-    top_games = df.nlargest(n, 'total_sales')[['title', 'platform', 'genre', 'publisher', 'total_sales', 'critic_score']]
-    
+def create_top_games_table(equals, year_range, isin=None, n=20, by='total_sales'):
+    """Create top games data table from the top-k index."""
+    top_games = top_games_index.top(n, by, ['title', 'platform', 'genre', 'publisher', 'total_sales', 'critic_score'],
+                                    equals=equals, ranges={'year': (year_range[0], year_range[1])}, isin=isin)
+    return render_top_games_table(top_games)
+
+def render_top_games_table(top_games):
+    """Render the top games as a data table."""
     return dash_table.DataTable(
         data=top_games.to_dict('records'),
         columns=[
@@ -218,6 +319,58 @@ def create_top_games_table(df, n=20):
         sort_action="native"
     )
 
+def approximate_dashboard(sample, equals, year_range, isin=None):
+    """Estimate every dashboard output from the filtered sample.
+
+    KPI cards show the estimate ± the 95% interval half-width. The figures
+    carry the same intervals as error bars (or in the hover text of the pie).
+    The top games table is exact: it comes from the top-k index, which
+    answers any filter in about a millisecond. So is the platform count,
+    which a sample would understate by missing platforms with few games.
+    """
+    games = estimate_totals(sample).iloc[0]
+    sales = estimate_totals(sample, 'total_sales').iloc[0]
+    mean = estimate_means(sample, 'total_sales').iloc[0]
+    total_games = f"{games['estimate']:,.0f} ± {games['ci']:,.0f}"
+    total_sales = f"{sales['estimate']:.1f} ± {sales['ci']:.1f}"
+    avg_sales = f"{mean['estimate']:.2f} ± {mean['ci']:.2f}"
+    platforms_count = backend.n_unique(
+        backend.filter_rows(charts_frame, equals=equals, ranges={'year': (year_range[0], year_range[1])}, isin=isin),
+        'platform')
+    
+    regions = [estimate_totals(sample, col).iloc[0] for col in REGION_COLUMNS]
+    regional_chart = plot_sales_by_region([r['estimate'] for r in regions], [r['ci'] for r in regions])
+    
+    platforms = estimate_totals(sample, 'total_sales', ['platform']).nlargest(15, 'estimate')
+    platforms = platforms.set_index('platform')
+    platform_chart = plot_platform_sales(platforms['estimate'], platforms['ci'].to_numpy())
+    
+    top_genres = estimate_totals(sample, 'total_sales', ['genre']).nlargest(5, 'estimate')['genre']
+    recent = sample[sample['genre'].isin(top_genres) & (sample['year'] >= 2000)]
+    genre_chart = plot_genre_trend(
+        estimate_totals(recent, 'total_sales', ['year', 'genre']).rename(columns={'estimate': 'total_sales'}),
+        'ci')
+    
+    yearly_chart = plot_yearly_sales(
+        estimate_totals(sample, 'total_sales', ['year']).rename(columns={'estimate': 'total_sales'}), 'ci')
+    
+    by_publisher = ['publisher']
+    mean_sales = estimate_means(sample, 'total_sales', by_publisher).set_index('publisher')
+    publisher_stats = pd.DataFrame({
+        'total_sales_sum': estimate_totals(sample, 'total_sales', by_publisher).set_index('publisher')['estimate'],
+        'avg_sales_per_game': mean_sales['estimate'],
+        'avg_sales_ci': mean_sales['ci'],
+        'game_count': estimate_totals(sample, None, by_publisher).set_index('publisher')['estimate'].round(),
+        'avg_critic_score': estimate_means(sample, 'critic_score', by_publisher).set_index('publisher')['estimate']
+    }).round(2)
+    publisher_chart = plot_publisher_analysis(publisher_stats, 'avg_sales_ci')
+    
+    top_games_table = create_top_games_table(equals, year_range, isin)
+    
+    figures = [mark_approximate(fig) for fig in
+               (regional_chart, platform_chart, genre_chart, yearly_chart, publisher_chart)]
+    return (total_games, total_sales, avg_sales, platforms_count, *figures, top_games_table)
+
 # App layout
 app.layout = dbc.Container([
     # Header
@@ -257,6 +410,18 @@ app.layout = dbc.Container([
                             )
                         ], width=6)
                     ], className="mb-3"),
+                    dbc.Row([
+                        dbc.Col([
+                            html.Label("Game Title:"),
+                            # Options are filled in by the title search callback as the user types
+                            dcc.Dropdown(
+                                id='title-search',
+                                options=[],
+                                placeholder="Search for a game to focus on its platforms and publisher",
+                                search_order='original'
+                            )
+                        ])
+                    ], className="mb-3"),
                     dbc.Row([
                         dbc.Col([
                             html.Label("Year Range:"),
@@ -266,6 +431,7 @@ app.layout = dbc.Container([
                                 max=int(data['charts']['year'].max()),
                                 value=[int(data['charts']['year'].min()), int(data['charts']['year'].max())],
                                 marks={str(year): str(year) for year in range(int(data['charts']['year'].min()), int(data['charts']['year'].max())+1, 10)},
+                                updatemode='mouseup',
                                 tooltip={"placement": "bottom", "always_visible": True}
                             )
                         ])
@@ -368,63 +534,149 @@ app.layout = dbc.Container([
                 ])
             ])
         ], width=12)
-    ])
+    ]),
+    
+    # The latest filter values, numbered per browser session
+    dcc.Store(id='filter-request'),
+    
+    # Filter values whose exact results are still to be computed
+    dcc.Store(id='exact-request')
     
 ], fluid=True)
 
 # Callbacks
-@app.callback(
-    [Output('total-games', 'children'),
-     Output('total-sales', 'children'),
-     Output('avg-sales', 'children'),
-     Output('platforms-count', 'children'),
-     Output('regional-sales-chart', 'figure'),
-     Output('platform-sales-chart', 'figure'),
-     Output('genre-trend-chart', 'figure'),
-     Output('yearly-sales-chart', 'figure'),
-     Output('publisher-analysis-chart', 'figure'),
-     Output('top-games-table', 'children')],
-    [Input('platform-filter', 'value'),
-     Input('genre-filter', 'value'),
-     Input('year-range-slider', 'value')]
-)
-def update_dashboard(platform_filter, genre_filter, year_range):
-    """Update all dashboard components based on filters."""
-    
-    # Filter data
-    filtered_data = data['charts'].copy()
-    
-    # Apply platform filter
+DASHBOARD_OUTPUTS = [
+    ('total-games', 'children'),
+    ('total-sales', 'children'),
+    ('avg-sales', 'children'),
+    ('platforms-count', 'children'),
+    ('regional-sales-chart', 'figure'),
+    ('platform-sales-chart', 'figure'),
+    ('genre-trend-chart', 'figure'),
+    ('yearly-sales-chart', 'figure'),
+    ('publisher-analysis-chart', 'figure'),
+    ('top-games-table', 'children')
+]
+
+FILTER_INPUTS = [Input('platform-filter', 'value'),
+                 Input('genre-filter', 'value'),
+                 Input('year-range-slider', 'value'),
+                 Input('title-search', 'value')]
+
+def filter_values(platform_filter, genre_filter):
+    """Turn the dropdown values into column equality filters."""
+    equals = {}
     if platform_filter != 'all':
-        filtered_data = filtered_data[filtered_data['platform'] == platform_filter]
-    
-    # Apply genre filter
+        equals['platform'] = platform_filter
     if genre_filter != 'all':
-        filtered_data = filtered_data[filtered_data['genre'] == genre_filter]
+        equals['genre'] = genre_filter
+    return equals
+
+def title_focus(title):
+    """Turn the searched title into isin filters on its platforms and publishers."""
+    return title_index.focus(title) if title else None
+
+def exact_dashboard(platform_filter, genre_filter, year_range, title=None, check=lambda: None):
+    """Compute every dashboard output exactly on the full charts table.
+
+    check is called before each chart and raises PreventUpdate to abandon
+    the work once a newer request has made it obsolete.
+    """
     
-    # Apply year range filter
-    filtered_data = filtered_data[
-        (filtered_data['year'] >= year_range[0]) & 
-        (filtered_data['year'] <= year_range[1])
-    ]
+    # Filter data (platform, genre, year range and the searched title's platforms and publishers)
+    equals = filter_values(platform_filter, genre_filter)
+    isin = title_focus(title)
+    filtered_data = backend.filter_rows(charts_frame, equals=equals, ranges={'year': (year_range[0], year_range[1])},
+                                        isin=isin)
     
     # Calculate metrics
-    total_games = len(filtered_data)
-    total_sales = f"{filtered_data['total_sales'].sum():.1f}"
-    avg_sales = f"{filtered_data['total_sales'].mean():.2f}"
-    platforms_count = filtered_data['platform'].nunique()
+    total_games = backend.n_rows(filtered_data)
+    total_sales = f"{backend.column_sums(filtered_data, ['total_sales'])['total_sales']:.1f}"
+    avg_sales = f"{backend.column_mean(filtered_data, 'total_sales'):.2f}"
+    platforms_count = backend.n_unique(filtered_data, 'platform')
     
     # Create visualizations
-    regional_chart = create_sales_by_region_chart(filtered_data)
-    platform_chart = create_platform_sales_chart(filtered_data)
-    genre_chart = create_genre_trend_chart(filtered_data)
-    yearly_chart = create_yearly_sales_chart(filtered_data)
-    publisher_chart = create_publisher_analysis_chart(filtered_data)
-    top_games_table = create_top_games_table(filtered_data)
-    
-    return (total_games, total_sales, avg_sales, platforms_count,
-            regional_chart, platform_chart, genre_chart, yearly_chart,
-            publisher_chart, top_games_table)
+    charts = []
+    for create_chart in (create_sales_by_region_chart, create_platform_sales_chart, create_genre_trend_chart,
+                         create_yearly_sales_chart, create_publisher_analysis_chart):
+        check()
+        charts.append(create_chart(filtered_data))
+    check()
+    top_games_table = create_top_games_table(equals, year_range, isin)
+    
+    return (total_games, total_sales, avg_sales, platforms_count, *charts, top_games_table)
+
+# Number each filter change per browser session; year slider changes are
+# debounced so only the value the user settles on reaches the server
+app.clientside_callback(
+    """
+    function(platform, genre, yearRange, title) {
+        const dc = window.dash_clientside;
+        const state = window.vgFilterRequests = window.vgFilterRequests ||
+            {session: Math.random().toString(36).slice(2), generation: 0};
+        const request = {session: state.session, generation: ++state.generation,
+                         filters: [platform, genre, yearRange, title]};
+        if (dc.callback_context.triggered_id !== 'year-range-slider') {
+            return request;
+        }
+        return new Promise(resolve => setTimeout(
+            () => resolve(request.generation === state.generation ? request : dc.no_update), %d));
+    }
+    """ % SLIDER_DEBOUNCE_MS,
+    Output('filter-request', 'data'),
+    FILTER_INPUTS
+)
+
+@app.callback(Output('title-search', 'options'), Input('title-search', 'search_value'),
+              State('title-search', 'value'))
+def update_title_options(search_value, selected):
+    """Offer the best matching titles for the text typed in the search box."""
+    if not search_value:
+        raise PreventUpdate
+    titles = title_index.search(search_value)
+    if selected and selected not in titles:
+        titles.append(selected)
+    # The dropdown filters options by their search text in the browser too;
+    # giving each one the typed text keeps the fuzzy matches in ranked order
+    return [{'label': title, 'value': title, 'search': search_value} for title in titles]
+
+# Requests a newer one from the same session has overtaken are dropped, whichever
+# worker process handles them; generations are kept in the result cache's file
+generations = RequestGenerations(result_cache.path)
+
+if data['sample'] is None:
+    @app.callback([Output(*output) for output in DASHBOARD_OUTPUTS], Input('filter-request', 'data'))
+    def update_dashboard(request):
+        """Update all dashboard components based on filters."""
+        if request is None:
+            raise PreventUpdate
+        generations.begin(request)
+        return result_cache.get_or_compute(
+            'exact', request['filters'],
+            lambda: exact_dashboard(*request['filters'], check=lambda: generations.check(request)))
+else:
+    @app.callback([Output(*output) for output in DASHBOARD_OUTPUTS] + [Output('exact-request', 'data')],
+                  Input('filter-request', 'data'))
+    def update_dashboard(request):
+        """Answer from the stratified sample at once, then request the exact result."""
+        if request is None:
+            raise PreventUpdate
+        generations.begin(request)
+        platform_filter, genre_filter, year_range, title = request['filters']
+        equals, isin = filter_values(platform_filter, genre_filter), title_focus(title)
+        outputs = result_cache.get_or_compute('approximate', request['filters'], lambda: approximate_dashboard(
+            filter_sample(data['sample'], equals, year_range, isin), equals, year_range, isin))
+        return (*outputs, request)
+
+    # Runs after the estimates are on screen and overwrites them
+    @app.callback([Output(*output, allow_duplicate=True) for output in DASHBOARD_OUTPUTS],
+                  Input('exact-request', 'data'), prevent_initial_call=True)
+    def update_dashboard_exact(request):
+        """Replace the sample estimates with exact results."""
+        generations.check(request)
+        return result_cache.get_or_compute(
+            'exact', request['filters'],
+            lambda: exact_dashboard(*request['filters'], check=lambda: generations.check(request)))
 
 if __name__ == '__main__':
     print("Starting Video Game Industry Dashboard...")
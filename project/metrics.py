@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Metrics Store for Video Game Dataset Analysis
+This module materialises the standard KPIs and business-question answers
+during preprocessing into a versioned JSON store, and answers queries from it
+using only the standard library, without pandas or the raw data.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+METRICS_FILE = 'processed_data/metrics.json'
+
+# Bump when metric names or shapes change incompatibly
+METRICS_VERSION = 1
+
+REGIONS = {
+    'na_sales': 'North America',
+    'jp_sales': 'Japan',
+    'pal_sales': 'PAL Region',
+    'other_sales': 'Other Regions'
+}
+
+TOP_N = 10
+
+def _value(value):
+    """Convert numpy scalars and NaN to plain JSON values."""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float):
+        return None if value != value else round(value, 4)
+    return value
+
+def _ranking(series, n=TOP_N):
+    """Return the top n entries of a Series as a list of [label, value] pairs."""
+    return [[_value(label), _value(value)] for label, value in series.head(n).items()]
+
+def build_metrics(charts, summary_stats=None):
+    """Compute the KPIs from the charts table (with a year column).
+
+    Only DataFrame methods are used here, so this module can be imported
+    for queries without pulling in pandas.
+    """
+    platform_sales = charts.groupby('platform')['total_sales'].sum().sort_values(ascending=False)
+    genre_sales = charts.groupby('genre')['total_sales'].sum().sort_values(ascending=False)
+    publisher_sales = charts.groupby('publisher')['total_sales'].sum().sort_values(ascending=False)
+    yearly_sales = charts.groupby('year')['total_sales'].sum().sort_index()
+    regional = charts[list(REGIONS)].sum()
+    regional_total = regional.sum()
+    top_games = charts.nlargest(TOP_N, 'total_sales')
+
+    metrics = {
+        'games': len(charts),
+        'total_sales': _value(charts['total_sales'].sum()),
+        'avg_sales_per_game': _value(charts['total_sales'].mean()),
+        'year_range': [_value(charts['year'].min()), _value(charts['year'].max())],
+        'platforms_count': _value(charts['platform'].nunique()),
+        'genres_count': _value(charts['genre'].nunique()),
+        'publishers_count': _value(charts['publisher'].nunique()),
+        'top_platform': _ranking(platform_sales, 1)[0],
+        'top_genre': _ranking(genre_sales, 1)[0],
+        'top_publisher': _ranking(publisher_sales, 1)[0],
+        'platform_sales': _ranking(platform_sales),
+        'genre_sales': _ranking(genre_sales),
+        'publisher_sales': _ranking(publisher_sales),
+        'platform_games': _ranking(charts['platform'].value_counts()),
+        'regional_sales': {REGIONS[col]: _value(total) for col, total in regional.items()},
+        'regional_share_pct': {REGIONS[col]: _value(100 * total / regional_total) if regional_total else None
+                               for col, total in regional.items()},
+        'top_game': [top_games['title'].iloc[0], top_games['platform'].iloc[0],
+                     _value(top_games['total_sales'].iloc[0])] if len(top_games) else None,
+        'top_games': [[row.title, row.platform, _value(row.total_sales)] for row in top_games.itertuples()],
+        'yearly_sales': {str(int(year)): _value(total) for year, total in yearly_sales.items()},
+        'peak_year': [int(yearly_sales.idxmax()), _value(yearly_sales.max())] if len(yearly_sales) else None,
+        'recent_trend_avg': _value(yearly_sales.tail(5).mean())
+    }
+    if summary_stats:
+        for name, value in summary_stats.items():
+            metrics.setdefault(name, [_value(v) for v in value] if isinstance(value, tuple) else _value(value))
+    return metrics
+
+def save_metrics(metrics, snapshot=None):
+    """Write the metrics store, tagged with the processed-data snapshot it describes."""
+    store = {
+        'version': METRICS_VERSION,
+        'snapshot': snapshot,
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metrics': metrics
+    }
+    temp_path = METRICS_FILE + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(store, f, indent=2)
+    os.replace(temp_path, METRICS_FILE)
+    return store
+
+def load_metrics(path=METRICS_FILE):
+    """Load the metrics store, checking its version."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; run data_preprocessing.py first")
+    with open(path) as f:
+        store = json.load(f)
+    if store.get('version') != METRICS_VERSION:
+        raise ValueError(f"metrics store version {store.get('version')} is not supported "
+                         f"(expected {METRICS_VERSION}); re-run data_preprocessing.py")
+    return store
+
+def business_answers(metrics):
+    """Return the answers to the standard business questions as text lines."""
+    lines = []
+    platform, sales = metrics['top_platform']
+    lines += ["1. Most popular platform:", f"   {platform} with {sales:.2f}M total sales"]
+    genre, sales = metrics['top_genre']
+    lines += ["2. Most popular genre:", f"   {genre} with {sales:.2f}M total sales"]
+    lines.append("3. Regional sales distribution:")
+    for region, total in metrics['regional_sales'].items():
+        lines.append(f"   {region}: {total:.2f}M ({metrics['regional_share_pct'][region]:.1f}%)")
+    title, platform, sales = metrics['top_game']
+    lines += ["4. Top selling game:", f"   {title} ({platform}) - {sales:.2f}M sales"]
+    year, sales = metrics['peak_year']
+    lines += ["5. Industry growth over time:", f"   Peak year: {year} with {sales:.2f}M sales",
+              f"   Recent trend: {metrics['recent_trend_avg']:.2f}M average (last 5 years)"]
+    return lines
+
+def query(names=None, as_json=False, path=METRICS_FILE):
+    """Print the requested metrics, or the business-question answers if none are named."""
+    store = load_metrics(path)
+    metrics = store['metrics']
+    if not names:
+        print('\n'.join(business_answers(metrics)))
+        return store
+    unknown = [name for name in names if name not in metrics]
+    if unknown:
+        print(f"Unknown metric(s): {', '.join(unknown)}. Available: {', '.join(sorted(metrics))}",
+              file=sys.stderr)
+        sys.exit(2)
+    for name in names:
+        value = metrics[name]
+        text = json.dumps(value) if as_json or isinstance(value, (dict, list)) else str(value)
+        print(f"{name}: {text}" if len(names) > 1 else text)
+    return store
+
+def list_metrics(path=METRICS_FILE):
+    """Print the names of the metrics in the store."""
+    store = load_metrics(path)
+    print(f"Metrics store v{store['version']}, snapshot {store['snapshot']}:")
+    for name in sorted(store['metrics']):
+        print(f"  {name}")
+    return store
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Answer KPI queries from the metrics store.")
+    parser.add_argument('names', nargs='*', help="metrics to print (default: business-question answers)")
+    parser.add_argument('--list', action='store_true', help="list the available metrics")
+    parser.add_argument('--json', action='store_true', help="print values as JSON")
+    parser.add_argument('--path', default=METRICS_FILE, help=f"metrics store (default: {METRICS_FILE})")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Command-line entry point."""
+    args = parse_args(argv)
+    if args.list:
+        list_metrics(args.path)
+    else:
+        query(args.names, args.json, args.path)
+
+if __name__ == "__main__":
+    main()
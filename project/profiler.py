@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Streaming Dataset Profiler for Video Game Dataset Analysis
+This script profiles CSV files in a single chunked pass. Each column keeps an
+exact null count, a HyperLogLog sketch for distinct values and, for numeric
+columns, a t-digest for quantiles. All sketches merge, so chunks can be
+profiled in parallel worker processes and memory stays constant.
+"""
+
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+PROFILE_FILE = 'processed_data/profiles.json'
+QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch with 2**p one-byte registers."""
+
+    def __init__(self, p=12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add(self, values):
+        """Add a Series of values (nulls are skipped by the caller)."""
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy()
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes << np.uint64(self.p)
+        # Position of the leftmost 1 bit in the remaining 64 - p bits
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = np.minimum(65 - bit_length, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """Estimate the number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are empty
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+class TDigest:
+    """Merging t-digest for approximate quantiles of a numeric column."""
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _compress(self, means, weights):
+        """Fold sorted centroids together so each covers under one unit of the k1 scale."""
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q_left = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        groups = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def add(self, values):
+        """Add an array of non-null numeric values."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        if len(other.means):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def quantile(self, q):
+        """Estimate the q-th quantile by interpolating between centroid centres."""
+        if not len(self.means):
+            return None
+        total = self.weights.sum()
+        centres = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * total, np.r_[0, centres, total],
+                               np.r_[self.min, self.means, self.max]))
+
+class ColumnProfile:
+    """Mergeable per-column statistics."""
+
+    def __init__(self, numeric):
+        self.numeric = numeric
+        self.rows = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.digest = TDigest() if numeric else None
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def add(self, series):
+        values = series.dropna()
+        self.rows += len(series)
+        self.nulls += len(series) - len(values)
+        self.distinct.add(values)
+        if self.numeric:
+            numbers = values.to_numpy(dtype=np.float64)
+            self.digest.add(numbers)
+            self.total += numbers.sum()
+            self.total_sq += np.square(numbers).sum()
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        if self.numeric and other.numeric:
+            self.digest.merge(other.digest)
+            self.total += other.total
+            self.total_sq += other.total_sq
+        elif self.numeric or other.numeric:
+            # A column that parsed as numbers in one chunk and text in another is text
+            self.numeric, self.digest = False, None
+        return self
+
+    def to_dict(self):
+        count = self.rows - self.nulls
+        result = {
+            'type': 'numeric' if self.numeric else 'text',
+            'nulls': self.nulls,
+            'null_pct': round(100 * self.nulls / self.rows, 2) if self.rows else 0.0,
+            'distinct_approx': self.distinct.count()
+        }
+        if self.numeric and count:
+            mean = self.total / count
+            variance = max(self.total_sq / count - mean * mean, 0.0) * count / max(count - 1, 1)
+            result.update({
+                'min': float(self.digest.min),
+                'max': float(self.digest.max),
+                'mean': mean,
+                'std': float(np.sqrt(variance)),
+                'quantiles': {f'p{int(q * 100):02d}': self.digest.quantile(q) for q in QUANTILES}
+            })
+        return result
+
+def profile_chunk(chunk):
+    """Profile one DataFrame chunk, returning {column: ColumnProfile}."""
+    profiles = {}
+    for col in chunk.columns:
+        series = chunk[col]
+        profile = ColumnProfile(pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series))
+        profile.add(series)
+        profiles[col] = profile
+    return profiles
+
+def merge_profiles(left, right):
+    """Merge two chunk profiles column by column."""
+    for col, profile in right.items():
+        if col in left:
+            left[col].merge(profile)
+        else:
+            left[col] = profile
+    return left
+
+def profile_file(path, chunksize=100_000, workers=1):
+    """Profile a CSV file in one pass, optionally sketching chunks in parallel.
+
+    The file is parsed chunk by chunk in this process. With workers > 1 each
+    chunk is sketched in a worker process, and at most two chunks per worker
+    are in flight, so memory stays bounded by the chunk size.
+    """
+    start = time.perf_counter()
+    profiles, chunks = {}, 0
+    reader = pd.read_csv(path, chunksize=chunksize)
+    if workers <= 1:
+        for chunk in reader:
+            merge_profiles(profiles, profile_chunk(chunk))
+            chunks += 1
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for chunk in reader:
+                pending.append(pool.submit(profile_chunk, chunk))
+                chunks += 1
+                if len(pending) >= 2 * workers:
+                    merge_profiles(profiles, pending.pop(0).result())
+            for future in pending:
+                merge_profiles(profiles, future.result())
+
+    rows = next(iter(profiles.values())).rows if profiles else 0
+    return {
+        'file': path,
+        'bytes': os.path.getsize(path),
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': round(time.perf_counter() - start, 3),
+        'columns': {col: profile.to_dict() for col, profile in profiles.items()}
+    }
+
+def print_profile(profile):
+    """Print a compact table of a file profile."""
+    print(f"\n{profile['file']}: {profile['rows']:,} rows, {profile['bytes'] / 1024**2:.2f} MB, "
+          f"{profile['chunks']} chunk(s) in {profile['seconds']:.2f}s")
+    for col, stats in profile['columns'].items():
+        line = f"  {col:<20} {stats['type']:<8} nulls {stats['null_pct']:6.2f}%  distinct ~{stats['distinct_approx']:,}"
+        if 'quantiles' in stats:
+            q = stats['quantiles']
+            line += f"  min {stats['min']:.4g}  p50 {q['p50']:.4g}  p99 {q['p99']:.4g}  max {stats['max']:.4g}"
+        print(line)
+
+def main(paths=None, chunksize=100_000, workers=1, output=PROFILE_FILE):
+    """Profile the given CSV files (all raw datasets by default) and write a JSON profile."""
+    if not paths:
+        from data_preprocessing import DATASET_FILES
+        paths = list(DATASET_FILES.values())
+
+    print("=" * 60)
+    print("STREAMING DATASET PROFILE")
+    print("=" * 60)
+
+    profiles = {}
+    for path in paths:
+        profiles[os.path.basename(path)] = profile = profile_file(path, chunksize, workers)
+        print_profile(profile)
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'generated': time.strftime('%Y-%m-%dT%H:%M:%S'), 'files': profiles}, f, indent=2)
+    print(f"\n✓ Profile written to {output}")
+    return profiles
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile CSV files in one streaming pass.")
+    parser.add_argument('paths', nargs='*', help="CSV files to profile (default: all raw datasets)")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="rows per chunk (default: 100000)")
+    parser.add_argument('--workers', type=int, default=1, help="processes sketching chunks (default: 1)")
+    parser.add_argument('--output', default=PROFILE_FILE, help=f"JSON output path (default: {PROFILE_FILE})")
+    args = parser.parse_args()
+    main(args.paths, args.chunksize, args.workers, args.output)
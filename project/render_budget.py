@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Render Budget for Video Game Dataset Analysis
+This module bounds what a dashboard figure sends to the browser: scatter
+traces with many points switch to WebGL, traces past a hard cap are thinned,
+and bar or pie traces with too many categories fold their tail into "Other".
+Every degradation is noted in the figure title and printed.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Scatter traces with more points than this are drawn with WebGL
+WEBGL_MIN_POINTS = 1000
+
+# Traces with more points than this keep an evenly spaced subset
+MAX_POINTS = 10_000
+
+# Bar and pie traces keep the largest categories and fold the rest into "Other"
+MAX_CATEGORIES = 20
+OTHER_LABEL = 'Other'
+
+def _points(trace):
+    """Number of points in a trace."""
+    values = trace.x if trace.x is not None else trace.y
+    return 0 if values is None else len(values)
+
+def _thin(trace, max_points):
+    """Keep an evenly spaced subset of a trace's points, including the last one."""
+    n = _points(trace)
+    keep = np.unique(np.linspace(0, n - 1, max_points).round().astype(int))
+    updates = {}
+    for attr in ('x', 'y', 'text', 'hovertext', 'customdata'):
+        values = getattr(trace, attr)
+        if values is not None and not isinstance(values, str) and len(values) == n:
+            updates[attr] = np.asarray(values, dtype=object)[keep]
+    for attr in ('error_x', 'error_y'):
+        error = getattr(trace, attr)
+        if error.array is not None and len(error.array) == n:
+            updates[attr] = {'array': np.asarray(error.array)[keep]}
+    if trace.marker.size is not None and np.ndim(trace.marker.size) == 1 and len(trace.marker.size) == n:
+        updates['marker'] = {'size': np.asarray(trace.marker.size)[keep]}
+    trace.update(updates)
+
+def _fold(values, keep, rest, how):
+    """One category array with the rest folded into a single trailing entry."""
+    values = np.asarray(values)
+    if how == 'sum':
+        tail = np.nansum(values[rest].astype(float))
+    elif how == 'quadrature':
+        tail = np.sqrt(np.nansum(values[rest].astype(float) ** 2))
+    else:
+        tail = OTHER_LABEL if how == 'label' else None
+    return list(values[keep]) + [tail]
+
+def _fold_categories(trace, max_categories):
+    """Fold the smallest categories of a bar or pie trace into "Other"; return how many were folded."""
+    if trace.type == 'pie':
+        label_attr, value_attr = 'labels', 'values'
+    else:
+        label_attr, value_attr = ('y', 'x') if trace.orientation == 'h' else ('x', 'y')
+    labels, values = getattr(trace, label_attr), getattr(trace, value_attr)
+    if labels is None or values is None or len(labels) <= max_categories:
+        return 0
+
+    values = np.asarray(values, dtype=float)
+    order = np.argsort(-np.nan_to_num(values, nan=-np.inf), kind='stable')
+    keep, rest = np.sort(order[:max_categories - 1]), order[max_categories - 1:]
+    n = len(values)
+    updates = {label_attr: _fold(labels, keep, rest, 'label'), value_attr: _fold(values, keep, rest, 'sum')}
+
+    # Other per-category arrays: error bars add in quadrature, colors that
+    # encode the value are summed, anything else is blank for "Other"
+    for attr in ('error_x', 'error_y'):
+        error = trace[attr] if attr in trace else None
+        if error is not None and error.array is not None and len(error.array) == n:
+            updates[attr] = {'array': _fold(error.array, keep, rest, 'quadrature')}
+    color = trace.marker.color if trace.type == 'bar' else None
+    if color is not None and not isinstance(color, str) and len(color) == n:
+        encodes_value = np.allclose(np.asarray(color, dtype=float), values, equal_nan=True)
+        updates['marker'] = {'color': _fold(color, keep, rest, 'sum' if encodes_value else None)}
+    for attr in ('text', 'hovertext', 'customdata'):
+        extra = getattr(trace, attr)
+        if extra is not None and not isinstance(extra, str) and len(extra) == n:
+            updates[attr] = _fold(extra, keep, rest, None)
+    trace.update(updates)
+    return len(rest)
+
+def apply_render_budget(fig, name, webgl_min_points=WEBGL_MIN_POINTS, max_points=MAX_POINTS,
+                        max_categories=MAX_CATEGORIES):
+    """Bring a figure within the render budget and return it."""
+    folded = shown = total = webgl = 0
+    traces = []
+    for trace in fig.data:
+        if trace.type in ('bar', 'pie'):
+            folded += _fold_categories(trace, max_categories)
+        elif trace.type in ('scatter', 'scattergl'):
+            points = _points(trace)
+            if points > max_points:
+                _thin(trace, max_points)
+                shown, total = shown + max_points, total + points
+            if trace.type == 'scatter' and points > webgl_min_points:
+                spec = trace.to_plotly_json()
+                spec.pop('type', None)
+                trace = go.Scattergl(spec, skip_invalid=True)
+                webgl += 1
+        traces.append(trace)
+
+    visible = []
+    if folded:
+        visible.append(f"{folded:,} smallest categories folded into {OTHER_LABEL}")
+    if total:
+        visible.append(f"{shown:,} of {total:,} points shown")
+    notes = visible + ([f"{webgl} trace{'s' if webgl > 1 else ''} drawn with WebGL"] if webgl else [])
+    if not notes:
+        return fig
+    # A figure's traces can only be reordered in place, so replaced ones need a new figure
+    fig = go.Figure(data=traces, layout=fig.layout)
+    if visible and fig.layout.title.text:
+        fig.update_layout(title_text=f"{fig.layout.title.text} ({'; '.join(visible)})")
+    print(f"⚠ Render budget: {name}: {'; '.join(notes)}")
+    return fig
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Exploration Report for Video Game Dataset Analysis
+This script builds the exploration tables and figures in parallel and writes
+them to one self-contained HTML file that embeds plotly.js once, so it can be
+generated headless on a server and opened anywhere.
+"""
+
+import os
+import html
+import argparse
+
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+
+from pipeline import stage, run_stages
+from cleaning import parse_dates_by_category
+from data_preprocessing import DATASET_FILES, load_dataset
+
+REPORT_FILE = 'reports/exploration_report.html'
+
+REGION_COLUMNS = ['na_sales', 'jp_sales', 'pal_sales', 'other_sales']
+SALES_COLUMNS = REGION_COLUMNS + ['total_sales']
+
+# Scatter traces above this many points are drawn from a fixed random sample
+MAX_POINTS = 5000
+
+def add_release_year(charts):
+    """Return the charts data with a year column parsed once from release_date."""
+    if 'year' in charts.columns:
+        return charts
+    charts = charts.copy()
+    charts['year'] = parse_dates_by_category(charts['release_date']).dt.year
+    return charts
+
+def downsample(df, max_points=MAX_POINTS, seed=0):
+    """Return at most max_points rows, and a note saying how many are shown."""
+    if len(df) <= max_points:
+        return df, ''
+    return df.sample(max_points, random_state=seed), f" ({max_points:,} of {len(df):,} points shown)"
+
+def sales_distribution_figure(charts):
+    """Box plots of regional sales from precomputed quartiles rather than raw points."""
+    fig = go.Figure()
+    for col in REGION_COLUMNS:
+        values = charts[col].dropna()
+        q1, median, q3 = values.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        lower = values[values >= q1 - 1.5 * iqr].min()
+        upper = values[values <= q3 + 1.5 * iqr].max()
+        fig.add_trace(go.Box(name=col, q1=[q1], median=[median], q3=[q3],
+                             lowerfence=[lower], upperfence=[upper]))
+    fig.update_layout(title="Sales Distribution by Region", yaxis_title="Sales (millions)")
+    return fig
+
+def platform_counts_figure(charts):
+    """Bar chart of the platforms with the most games."""
+    platform_counts = charts['platform'].value_counts().head(15)
+    return px.bar(x=platform_counts.index, y=platform_counts.values,
+                  title="Top 15 Platforms by Number of Games",
+                  labels={'x': 'Platform', 'y': 'Number of Games'})
+
+def genre_trend_figure(charts):
+    """Line chart of game counts per year for the five largest genres."""
+    top_genres = charts['genre'].value_counts().head(5).index
+    genre_year = (charts[charts['genre'].isin(top_genres)]
+                  .groupby(['year', 'genre']).size().reset_index(name='count'))
+    return px.line(genre_year, x='year', y='count', color='genre',
+                   title="Top 5 Genres Popularity Over Time",
+                   labels={'count': 'Number of Games', 'year': 'Release Year'})
+
+def sales_vs_score_figure(charts):
+    """Scatter of total sales against critic score, downsampled when large."""
+    points, note = downsample(charts.dropna(subset=['critic_score']))
+    return px.scatter(points, x='critic_score', y='total_sales', opacity=0.6,
+                      title=f"Total Sales vs Critic Score{note}",
+                      labels={'critic_score': 'Critic Score', 'total_sales': 'Total Sales (millions)'})
+
+def regional_share_figure(charts):
+    """Pie chart of total sales per region."""
+    regional_sales = charts[REGION_COLUMNS].sum()
+    return px.pie(values=regional_sales.values, names=regional_sales.index,
+                  title="Total Sales Distribution by Region")
+
+# name -> builder taking the charts data with a year column
+FIGURES = {
+    'sales_distribution': sales_distribution_figure,
+    'platform_counts': platform_counts_figure,
+    'genre_trend': genre_trend_figure,
+    'sales_vs_score': sales_vs_score_figure,
+    'regional_share': regional_share_figure
+}
+
+def _table(df, **kwargs):
+    """Render a DataFrame as an HTML table."""
+    return df.to_html(classes='table', border=0, float_format=lambda v: f'{v:,.2f}', **kwargs)
+
+def dataset_section(df, name):
+    """Overview, column summary and numeric statistics of one dataset."""
+    missing = df.isnull().sum()
+    columns = pd.DataFrame({
+        'Type': df.dtypes.astype(str),
+        'Missing': missing,
+        'Missing %': missing / max(len(df), 1) * 100,
+        'Unique': df.nunique()
+    })
+    numeric = df.select_dtypes(include=[np.number])
+    parts = [
+        f"<h2 id='dataset-{name}'>Dataset: {html.escape(name)}</h2>",
+        f"<p>{df.shape[0]:,} rows × {df.shape[1]} columns, "
+        f"{df.memory_usage(deep=True).sum() / 1024**2:.2f} MB in memory</p>",
+        _table(columns),
+        "<h3>First rows</h3>", _table(df.head(), index=False)
+    ]
+    if len(numeric.columns):
+        parts += ["<h3>Numeric columns</h3>", _table(numeric.describe())]
+    return '\n'.join(parts)
+
+def charts_detail_section(charts):
+    """Tables answering the detailed questions about the charts dataset."""
+    top_games = charts.nlargest(10, 'total_sales')[['title', 'platform', 'genre', 'total_sales']]
+    counts = {
+        'Platforms': charts['platform'].value_counts().head(10),
+        'Genres': charts['genre'].value_counts().head(10),
+        'Publishers': charts['publisher'].value_counts().head(10),
+        'Games per year (last 10)': charts['year'].value_counts().sort_index().tail(10)
+    }
+    parts = [
+        "<h2 id='charts-detail'>Detailed analysis: vg_charts</h2>",
+        f"<p>Release years {charts['year'].min():.0f} to {charts['year'].max():.0f}</p>",
+        "<h3>Sales statistics</h3>", _table(charts[SALES_COLUMNS].describe()),
+        "<h3>Top 10 games by total sales</h3>", _table(top_games, index=False)
+    ]
+    for title, series in counts.items():
+        parts += [f"<h3>{title}</h3>", _table(series.rename('games').to_frame())]
+    return '\n'.join(parts)
+
+def build_report_stages(datasets=None):
+    """Describe the report as pipeline stages: loads, tables and figures.
+
+    Pass already loaded datasets to skip reading the CSV files again.
+    """
+    load = datasets.__getitem__ if datasets else load_dataset
+    stages = [stage(f'load_{name}', lambda name=name: load(name)) for name in DATASET_FILES]
+    stages.append(stage('charts_with_year', add_release_year, ['load_charts']))
+    stages += [stage(f'table_{name}', lambda df, name=name: dataset_section(df, name), [f'load_{name}'])
+               for name in DATASET_FILES]
+    stages.append(stage('table_charts_detail', charts_detail_section, ['charts_with_year']))
+    stages += [stage(f'figure_{name}', build, ['charts_with_year']) for name, build in FIGURES.items()]
+    return stages
+
+def render_report(results):
+    """Assemble the report HTML with a single inline copy of plotly.js."""
+    tables = [results[f'table_{name}'] for name in DATASET_FILES] + [results['table_charts_detail']]
+    figures = [
+        results[f'figure_{name}'].to_html(full_html=False, include_plotlyjs=False, div_id=f'figure-{name}')
+        for name in FIGURES
+    ]
+    toc = ''.join(f"<li><a href='#dataset-{name}'>{name}</a></li>" for name in DATASET_FILES)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Video Game Dataset Exploration</title>
+<script type="text/javascript">{get_plotlyjs()}</script>
+<style>
+body {{ font-family: sans-serif; margin: 2em auto; max-width: 1200px; color: #343a40; }}
+.table {{ border-collapse: collapse; margin: 0.5em 0 1.5em; font-size: 13px; }}
+.table th, .table td {{ padding: 4px 10px; border-bottom: 1px solid #dee2e6; text-align: right; }}
+.table th:first-child, .table td:first-child {{ text-align: left; }}
+</style>
+</head>
+<body>
+<h1>Video Game Dataset Exploration</h1>
+<ul>{toc}<li><a href='#charts-detail'>vg_charts details</a></li><li><a href='#figures'>Figures</a></li></ul>
+{''.join(tables)}
+<h2 id='figures'>Figures</h2>
+{''.join(figures)}
+</body>
+</html>
+"""
+
+def write_report(datasets=None, output=REPORT_FILE, workers=4):
+    """Build the report in parallel and write it to one HTML file."""
+    results, _ = run_stages(build_report_stages(datasets), max_workers=workers, track_memory=False)
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(render_report(results))
+    print(f"✓ Exploration report written to {output} ({os.path.getsize(output) / 1024**2:.1f} MB)")
+    return output
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the exploration report as one HTML file.")
+    parser.add_argument('--output', default=REPORT_FILE, help=f"report path (default: {REPORT_FILE})")
+    parser.add_argument('--workers', type=int, default=4, help="stages to build at once (default: 4)")
+    args = parser.parse_args()
+    write_report(output=args.output, workers=args.workers)
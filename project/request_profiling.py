@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Request Profiling for Video Game Dataset Analysis
+This module profiles single dashboard callback requests with cProfile on
+demand: when the request carries an X-Profile header or a ?profile=1 flag,
+when the browser opened the dashboard with ?profile=1, or for a random
+sample of requests. Profiles are saved as pstats files, and /_profiles lists
+the most recent ones with their filter inputs.
+"""
+
+import os
+import io
+import json
+import time
+import random
+import pstats
+import cProfile
+import threading
+from html import escape
+
+PROFILE_DIR = 'reports/profiles'
+INDEX_FILE = 'index.jsonl'
+CALLBACK_PATH = '/_dash-update-component'
+INDEX_ROUTE = '/_profiles'
+
+# Fraction of callback requests profiled without being asked; 0 turns sampling off
+PROFILE_RATE = float(os.environ.get('VG_PROFILE_RATE', 0))
+
+# Profiles kept on disk and shown in the index; older ones are deleted
+MAX_PROFILES = 200
+
+# Opening the dashboard with ?profile=1 profiles that browser's callbacks for this long
+COOKIE_NAME = 'vg_profile'
+COOKIE_SECONDS = 600
+
+# The index is rewritten without the records of deleted profiles once it is this large
+MAX_INDEX_BYTES = 1024**2
+
+# Functions listed on a profile's page
+TOP_FUNCTIONS = 40
+
+def _profile_reason(request, sample_rate):
+    """Why this callback request should be profiled, or None."""
+    if request.headers.get('X-Profile'):
+        return 'header'
+    if request.args.get('profile'):
+        return 'query'
+    if request.cookies.get(COOKIE_NAME):
+        return 'cookie'
+    if sample_rate and random.random() < sample_rate:
+        return 'sample'
+    return None
+
+def _read_index(directory):
+    """Records of the profiles still on disk, newest first."""
+    path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [r for r in records[::-1] if os.path.exists(os.path.join(directory, r['file']))]
+
+def _record(directory, entry):
+    """Append a profile record and delete the oldest profiles beyond MAX_PROFILES.
+
+    Every server process appends to the same index with single writes, and
+    file names start with the time, so this is safe across workers.
+    """
+    index = os.path.join(directory, INDEX_FILE)
+    with open(index, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+    names = sorted(name for name in os.listdir(directory) if name.endswith('.pstats'))
+    for name in names[:-MAX_PROFILES]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+    if os.path.getsize(index) > MAX_INDEX_BYTES:
+        temp_path = f'{index}.{os.getpid()}.tmp'
+        with open(temp_path, 'w') as f:
+            for record in _read_index(directory)[::-1]:
+                f.write(json.dumps(record) + '\n')
+        os.replace(temp_path, index)
+
+def _callback_summary(body):
+    """The outputs and input values of a callback request body."""
+    body = body or {}
+    outputs = body.get('output', '').strip('.').split('...')
+    inputs = {f"{item.get('id')}.{item.get('property')}": item.get('value') for item in body.get('inputs', [])}
+    return outputs, inputs
+
+def _callback_label(outputs):
+    """The first output of a callback, and how many more it has."""
+    return outputs[0] if len(outputs) == 1 else f"{outputs[0]} +{len(outputs) - 1}"
+
+def install_profiling(app, directory=PROFILE_DIR, sample_rate=PROFILE_RATE):
+    """Add on-demand cProfile profiling of callback requests and the /_profiles pages."""
+    from flask import request, g, abort, send_from_directory
+
+    os.makedirs(directory, exist_ok=True)
+    server = app.server
+    # cProfile can only profile one request at a time (Python 3.12 allows a
+    # single active profiler), so concurrent requests go unprofiled
+    active = threading.Lock()
+
+    @server.before_request
+    def start_profile():
+        if not request.path.endswith(CALLBACK_PATH):
+            return
+        reason = _profile_reason(request, sample_rate)
+        if reason is None or not active.acquire(blocking=False):
+            return
+        g.profile = (cProfile.Profile(), reason, time.perf_counter())
+        try:
+            g.profile[0].enable()
+        except ValueError:
+            active.release()
+            g.profile = None
+
+    @server.after_request
+    def finish_profile(response):
+        if request.path.rstrip('/') == '' and request.args.get('profile'):
+            response.set_cookie(COOKIE_NAME, '1', max_age=COOKIE_SECONDS, httponly=True, samesite='Strict')
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+        profiler, reason, start = profile
+        profiler.disable()
+        active.release()
+
+        elapsed = time.perf_counter() - start
+        stamp = time.strftime('%Y%m%dT%H%M%S')
+        name = f"{stamp}_{os.getpid()}_{random.randrange(16**6):06x}.pstats"
+        profiler.dump_stats(os.path.join(directory, name))
+        outputs, inputs = _callback_summary(request.get_json(silent=True))
+        _record(directory, {'file': name, 'time': stamp, 'seconds': round(elapsed, 4), 'reason': reason,
+                            'status': response.status_code, 'outputs': outputs, 'inputs': inputs})
+        response.headers['X-Profile-File'] = name
+        return response
+
+    @server.teardown_request
+    def stop_abandoned_profile(exc):
+        # A request that failed before after_request still holds the profiler
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile[0].disable()
+            active.release()
+
+    @server.route(INDEX_ROUTE)
+    def profile_index():
+        rows = ''.join(
+            f"<tr><td>{escape(r['time'])}</td><td>{r['seconds'] * 1000:,.0f} ms</td><td>{escape(r['reason'])}</td>"
+            f"<td>{r['status']}</td><td>{escape(_callback_label(r['outputs']))}</td>"
+            f"<td><code>{escape(json.dumps(r['inputs']))}</code></td>"
+            f"<td><a href='{INDEX_ROUTE}/{r['file']}'>top functions</a> · "
+            f"<a href='{INDEX_ROUTE}/{r['file']}/download'>pstats</a></td></tr>"
+            for r in _read_index(directory)
+        )
+        return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Callback profiles</title>"
+                f"<style>body{{font-family:sans-serif}} td,th{{padding:3px 8px;text-align:left;"
+                f"border-bottom:1px solid #ddd;font-size:13px}}</style></head><body>"
+                f"<h1>Callback profiles</h1><p>Newest first; open one with "
+                f"<code>python -m pstats FILE</code> or snakeviz.</p><table><tr><th>Time</th><th>Duration</th>"
+                f"<th>Trigger</th><th>Status</th><th>Callback</th><th>Inputs</th><th></th></tr>{rows}</table>"
+                f"</body></html>")
+
+    def _profile_path(name):
+        if name not in {r['file'] for r in _read_index(directory)}:
+            abort(404)
+        return os.path.join(directory, name)
+
+    @server.route(f'{INDEX_ROUTE}/<name>')
+    def profile_top(name):
+        text = io.StringIO()
+        pstats.Stats(_profile_path(name), stream=text).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        return f"<!DOCTYPE html><html><body><p><a href='{INDEX_ROUTE}'>All profiles</a></p>" \
+               f"<pre>{escape(text.getvalue())}</pre></body></html>"
+
+    @server.route(f'{INDEX_ROUTE}/<name>/download')
+    def profile_download(name):
+        _profile_path(name)
+        return send_from_directory(os.path.abspath(directory), name, as_attachment=True)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Result Cache for Video Game Dataset Analysis
+This module keeps computed dashboard results (aggregates and serialized
+figures) in a SQLite file shared by every server process. Keys include the
+processed-data snapshot, so a refresh never serves stale results, and the
+least recently used entries are evicted once the file passes a size limit.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import argparse
+import threading
+
+CACHE_FILE = os.environ.get('VG_CACHE_PATH', 'processed_data/result_cache.sqlite')
+
+# Total size of the stored (compressed) results; 0 disables the cache
+MAX_BYTES = int(float(os.environ.get('VG_CACHE_MAX_MB', 256)) * 1024**2)
+
+# Bump when the shape of cached results changes, so old entries are not reused
+CACHE_VERSION = 3
+
+# Eviction frees space down to this fraction of the limit, so it runs rarely
+EVICT_TO = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    snapshot TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+class ResultCache:
+    """A size-bounded, cross-process cache of JSON-serializable results."""
+
+    def __init__(self, snapshot, path=CACHE_FILE, max_bytes=MAX_BYTES, namespace=''):
+        self.snapshot = str(snapshot)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.hits = self.misses = 0
+        self._local = threading.local()
+        if self.enabled:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with self._connection() as con:
+                con.executescript(SCHEMA)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _connection(self):
+        """One connection per thread; WAL lets readers in other processes run during writes."""
+        con = getattr(self._local, 'con', None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=10)
+            con.execute('PRAGMA journal_mode=WAL')
+            con.execute('PRAGMA synchronous=NORMAL')
+            self._local.con = con
+        return con
+
+    def key(self, kind, params):
+        """Hash the result kind and parameters together with the snapshot and cache version."""
+        text = json.dumps([CACHE_VERSION, self.snapshot, self.namespace, kind, params],
+                          sort_keys=True, default=str)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key):
+        """Return the stored JSON text for a key, or None."""
+        con = self._connection()
+        row = con.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        with con:
+            con.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), key))
+        return zlib.decompress(row[0]).decode()
+
+    def put(self, key, kind, text):
+        """Store JSON text under a key, evicting the least recently used results if needed."""
+        value = zlib.compress(text.encode(), 1)
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        con = self._connection()
+        with con:
+            con.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (key, self.snapshot, kind, value, len(value), now, now))
+            total = con.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(con, total - EVICT_TO * self.max_bytes)
+
+    def _evict(self, con, excess):
+        """Delete the least recently used results until excess bytes are freed."""
+        freed, keys = 0, []
+        for key, size in con.execute('SELECT key, size FROM results ORDER BY last_used'):
+            if freed >= excess:
+                break
+            keys.append((key,))
+            freed += size
+        con.executemany('DELETE FROM results WHERE key = ?', keys)
+
+    def get_or_compute(self, kind, params, compute):
+        """Return a cached result, or compute, store and return it.
+
+        Results are stored as JSON (figures and components through Plotly's
+        encoder), so a hit returns the decoded JSON, which Dash sends
+        unchanged.
+        """
+        if not self.enabled:
+            return compute()
+        from plotly.utils import PlotlyJSONEncoder
+        key = self.key(kind, params)
+        text = self.get(key)
+        if text is not None:
+            self.hits += 1
+            return json.loads(text)
+        self.misses += 1
+        result = compute()
+        self.put(key, kind, json.dumps(result, cls=PlotlyJSONEncoder))
+        return result
+
+def cache_stats(path=CACHE_FILE):
+    """Entries and stored bytes per snapshot and result kind."""
+    con = sqlite3.connect(path)
+    return con.execute('SELECT snapshot, kind, COUNT(*), SUM(size) FROM results '
+                       'GROUP BY snapshot, kind ORDER BY snapshot, kind').fetchall()
+
+def clear_cache(path=CACHE_FILE, keep_snapshot=None):
+    """Delete all results, or all but those of one snapshot; return how many were deleted."""
+    con = sqlite3.connect(path)
+    with con:
+        if keep_snapshot is None:
+            deleted = con.execute('DELETE FROM results').rowcount
+        else:
+            deleted = con.execute('DELETE FROM results WHERE snapshot != ?', (keep_snapshot,)).rowcount
+    con.execute('VACUUM')
+    return deleted
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clear the shared dashboard result cache.")
+    parser.add_argument('--path', default=CACHE_FILE, help=f"cache file (default: {CACHE_FILE})")
+    parser.add_argument('--clear', action='store_true', help="delete cached results")
+    parser.add_argument('--keep-snapshot', help="with --clear, keep the results of this snapshot")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"No result cache at {args.path}")
+    elif args.clear:
+        print(f"✓ Deleted {clear_cache(args.path, args.keep_snapshot):,} cached results")
+    else:
+        rows = cache_stats(args.path)
+        print(f"{'Snapshot':<32}{'Kind':<14}{'Entries':>9}{'MB':>9}")
+        for snapshot, kind, count, size in rows:
+            print(f"{snapshot:<32}{kind:<14}{count:>9,}{size / 1024**2:>9.2f}")
+        print(f"{'Total':<46}{sum(r[2] for r in rows):>9,}{sum(r[3] for r in rows) / 1024**2:>9.2f}")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Stratified Sampling for Video Game Dataset Analysis
+This module builds a stratified sample of the charts table (by platform, genre
+and decade) and estimates dashboard totals, counts and means from it with
+95% confidence intervals.
+"""
+
+import numpy as np
+import pandas as pd
+
+from storage import write_table
+
+SAMPLE_TABLE = 'charts_sample'
+STRATA = ['platform', 'genre', 'decade']
+SAMPLE_FRACTION = 0.05
+MIN_PER_STRATUM = 5
+
+# Sales are heavy-tailed, so the best sellers are always kept (weight 1) in
+# their own take-all stratum instead of being left to chance
+CERTAINTY_QUANTILE = 0.99
+CERTAINTY_STRATUM = -1
+
+Z_95 = 1.96
+
+# Columns added to every sampled row
+SAMPLE_COLUMNS = ['stratum', 'stratum_rows', 'sample_rows']
+
+def build_stratified_sample(df, fraction=SAMPLE_FRACTION, min_per_stratum=MIN_PER_STRATUM, seed=0):
+    """Draw a simple random sample without replacement inside each stratum.
+
+    Each stratum keeps fraction of its rows, but at least min_per_stratum
+    (or all of them if it is smaller). Every sampled row records its stratum,
+    the stratum size N and the stratum sample size n, which is all the
+    estimators need.
+    """
+    rng = np.random.default_rng(seed)
+    sales = df['total_sales'].fillna(0).to_numpy()
+    certain = sales >= np.quantile(sales, CERTAINTY_QUANTILE) if len(df) else np.zeros(0, dtype=bool)
+    stratum = df.groupby(STRATA, dropna=False, sort=True).ngroup().to_numpy()
+    stratum = np.where(certain, CERTAINTY_STRATUM, stratum)
+
+    codes, inverse, sizes = np.unique(stratum, return_inverse=True, return_counts=True)
+    wanted = np.minimum(sizes, np.maximum(min_per_stratum, np.ceil(fraction * sizes))).astype(np.int64)
+    wanted[codes == CERTAINTY_STRATUM] = sizes[codes == CERTAINTY_STRATUM]
+
+    # Rank rows within their stratum in random order and keep the first n
+    order = np.lexsort((rng.random(len(df)), inverse))
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[order] = np.arange(len(df)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    keep = rank < wanted[inverse]
+
+    sample = df.iloc[np.flatnonzero(keep)].reset_index(drop=True)
+    sample['stratum'] = stratum[keep]
+    sample['stratum_rows'] = sizes[inverse[keep]]
+    sample['sample_rows'] = wanted[inverse[keep]]
+    return sample
+
+def save_sample(sample, fraction=SAMPLE_FRACTION):
+    """Save the sample as a table and return its manifest entry."""
+    return write_table(sample, SAMPLE_TABLE,
+                       extra={'sample': {'of': 'charts', 'strata': STRATA, 'fraction': fraction}})
+
+def filter_sample(sample, equals=None, year_range=None, isin=None):
+    """Keep the sampled rows in the filtered domain."""
+    mask = np.ones(len(sample), dtype=bool)
+    for col, value in (equals or {}).items():
+        mask &= (sample[col] == value).to_numpy()
+    for col, values in (isin or {}).items():
+        mask &= sample[col].isin(values).to_numpy()
+    if year_range is not None:
+        mask &= sample['year'].between(year_range[0], year_range[1]).to_numpy()
+    return sample[mask]
+
+def _group_codes(sample, columns):
+    """Number the distinct combinations of some columns; rows with a missing key get -1."""
+    codes = np.zeros(len(sample), dtype=np.int64)
+    valid = np.ones(len(sample), dtype=bool)
+    for col in columns:
+        col_codes, uniques = pd.factorize(sample[col])
+        valid &= col_codes >= 0
+        codes = codes * (len(uniques) + 1) + col_codes
+    codes = pd.factorize(codes)[0]
+    return np.where(valid, codes, -1)
+
+def estimate_totals(sample, value=None, by=()):
+    """Estimate the domain total of a column (or the row count) per group.
+
+    Uses the stratified expansion estimator: each sampled row stands for
+    N/n rows of its stratum. The variance adds up over strata as
+    N^2 (1 - n/N) s^2 / n, where s^2 is the sample variance of the value
+    within the stratum, counting rows outside the domain as zero. Returns
+    a frame with the group columns, 'estimate' and 'ci' (95% half-width).
+    """
+    by = list(by)
+    y = np.ones(len(sample)) if value is None else sample[value].fillna(0).to_numpy(dtype=np.float64)
+    group = _group_codes(sample, by)
+    keep = group >= 0
+    group, y = group[keep], y[keep]
+
+    # One cell per (group, stratum) holds the stratum's share of the group
+    cells = pd.DataFrame({'group': group, 'stratum': sample['stratum'].to_numpy()[keep]})
+    cell = _group_codes(cells, ['group', 'stratum'])
+    first = np.unique(cell, return_index=True)[1]
+    s1 = np.bincount(cell, weights=y, minlength=len(first))
+    s2 = np.bincount(cell, weights=y * y, minlength=len(first))
+    N = sample['stratum_rows'].to_numpy(dtype=np.float64)[keep][first]
+    n = sample['sample_rows'].to_numpy(dtype=np.float64)[keep][first]
+
+    within = np.clip((s2 - s1 ** 2 / n) / np.maximum(n - 1, 1), 0, None)
+    cell_group = group[first]
+    n_groups = group.max() + 1 if len(group) else 0
+    estimate = np.bincount(cell_group, weights=N / n * s1, minlength=n_groups)
+    variance = np.bincount(cell_group, weights=N ** 2 * (1 - n / N) * within / n, minlength=n_groups)
+
+    if by:
+        rows = np.flatnonzero(keep)[np.unique(group, return_index=True)[1]]
+        result = sample[by].iloc[rows].reset_index(drop=True)
+    else:
+        result = pd.DataFrame(index=[0])
+        estimate, variance = np.append(estimate, 0.0)[:1], np.append(variance, 0.0)[:1]
+    result['estimate'] = estimate
+    result['ci'] = Z_95 * np.sqrt(variance)
+    return result.sort_values(by).reset_index(drop=True) if by else result
+
+def estimate_means(sample, value, by=()):
+    """Estimate the mean of a column per group as a ratio of two totals.
+
+    Rows where the value is missing are left out, as pandas does. The
+    interval comes from the linearised ratio: the total of (y - mean) over
+    the domain, divided by the estimated row count.
+    """
+    by = list(by)
+    sample = sample[sample[value].notna()]
+    totals = estimate_totals(sample, value, by)
+    counts = estimate_totals(sample, None, by)
+    result = counts[by].copy() if by else pd.DataFrame(index=[0])
+    result['estimate'] = totals['estimate'] / counts['estimate']
+
+    if by:
+        means = result.set_index(by)['estimate']
+        row_means = means.reindex(pd.MultiIndex.from_frame(sample[by]) if len(by) > 1 else sample[by[0]]).to_numpy()
+    else:
+        row_means = np.full(len(sample), result['estimate'].iloc[0])
+    residuals = sample.assign(__residual=sample[value].to_numpy(dtype=np.float64) - row_means)
+    spread = estimate_totals(residuals, '__residual', by)
+    result['ci'] = spread['ci'] / counts['estimate']
+    return result
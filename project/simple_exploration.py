@@ -21,6 +21,8 @@ except ImportError:
     print("pip install --user pandas numpy")
     sys.exit(1)
 
+from metrics import build_metrics, business_answers
+
 def load_and_explore_datasets():
     """Load and explore all datasets."""
     print("=" * 80)
@@ -69,7 +71,7 @@ def load_and_explore_datasets():
     return datasets
 
 def analyze_charts_dataset(df):
-    """Analyze the main charts dataset."""
+    """Analyze the main charts dataset (see profiler.py for a streaming profile)."""
     print("\n" + "=" * 60)
     print("VG_CHARTS DATASET ANALYSIS")
     print("=" * 60)
@@ -183,11 +185,8 @@ def main():
     print(f"Total datasets loaded: {len(datasets)}")
     print(f"Main dataset (charts) shape: {datasets['charts'].shape}")
     print(f"Total games in dataset: {len(datasets['charts'])}")
-    # Extract year for date range
-    charts_copy = datasets['charts'].copy()
-    charts_copy['year'] = pd.to_datetime(charts_copy['release_date'], errors='coerce').dt.year
-    valid_years = charts_copy['year'].dropna()
-    print(f"Date range: {valid_years.min()} to {valid_years.max()}")
+    # analyze_charts_dataset already derived the year from release_date
+    print(f"Date range: {charts_analysis['year_range'][0]} to {charts_analysis['year_range'][1]}")
     print(f"Total platforms: {datasets['charts']['platform'].nunique()}")
     print(f"Total genres: {datasets['charts']['genre'].nunique()}")
     print(f"Total publishers: {datasets['charts']['publisher'].nunique()}")
@@ -196,32 +195,9 @@ def main():
     print("BUSINESS QUESTIONS ANALYSIS")
     print("=" * 60)
     
-    # Answer some business questions
-    charts = datasets['charts']
-    
-    print("\n1. Most popular platform:")
-    platform_sales = charts.groupby('platform')['total_sales'].sum().sort_values(ascending=False)
-    print(f"   {platform_sales.index[0]} with {platform_sales.iloc[0]:.2f}M total sales")
-    
-    print("\n2. Most popular genre:")
-    genre_sales = charts.groupby('genre')['total_sales'].sum().sort_values(ascending=False)
-    print(f"   {genre_sales.index[0]} with {genre_sales.iloc[0]:.2f}M total sales")
-    
-    print("\n3. Regional sales distribution:")
-    regional_totals = charts[['na_sales', 'jp_sales', 'pal_sales', 'other_sales']].sum()
-    for region, total in regional_totals.items():
-        print(f"   {region}: {total:.2f}M ({total/regional_totals.sum()*100:.1f}%)")
-    
-    print("\n4. Top selling game:")
-    top_game = charts.loc[charts['total_sales'].idxmax()]
-    print(f"   {top_game['title']} ({top_game['platform']}) - {top_game['total_sales']:.2f}M sales")
-    
-    print("\n5. Industry growth over time:")
-    # Extract year from release_date
-    charts['year'] = pd.to_datetime(charts['release_date'], errors='coerce').dt.year
-    yearly_sales = charts.groupby('year')['total_sales'].sum().sort_index()
-    print(f"   Peak year: {yearly_sales.idxmax()} with {yearly_sales.max():.2f}M sales")
-    print(f"   Recent trend: {yearly_sales.tail(5).mean():.2f}M average (last 5 years)")
+    # Answer the business questions with the same code that fills the metrics
+    # store; `python metrics.py` answers them from processed data without pandas
+    print("\n".join(business_answers(build_metrics(datasets['charts']))))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Processed Data Storage for Video Game Dataset Analysis
+This module writes processed tables as Parquet files described by a versioned
+manifest, and reads them back with partition and row-group pruning. Every
+write goes to a new version directory; publishing the manifest switches
+readers over at once, and versions no manifest refers to are then deleted.
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import uuid
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+PROCESSED_DIR = 'processed_data'
+MANIFEST_FILE = os.path.join(PROCESSED_DIR, 'manifest.json')
+
+# Bump when the on-disk layout changes in a way old readers cannot handle
+LAYOUT_VERSION = 1
+
+# Rows are sorted by this column inside each file so row-group min/max
+# statistics on it are tight enough to skip groups
+SORT_COLUMN = 'year'
+ROW_GROUP_SIZE = 64_000
+
+_OPERATORS = {
+    '==': lambda f, v: f == v,
+    '!=': lambda f, v: f != v,
+    '<': lambda f, v: f < v,
+    '<=': lambda f, v: f <= v,
+    '>': lambda f, v: f > v,
+    '>=': lambda f, v: f >= v,
+    'in': lambda f, v: f.isin(np.asarray(v)),
+    'not in': lambda f, v: ~f.isin(np.asarray(v))
+}
+
+def _json_value(value):
+    """Convert a numpy or pandas scalar to a JSON-friendly value."""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _partition_dir(partition):
+    """Build a hive-style directory name such as decade=2000/platform_generation=7th Gen."""
+    parts = []
+    for col, value in partition.items():
+        text = 'null' if value is None else str(value)
+        parts.append(f"{col}={re.sub(r'[^0-9A-Za-z._ -]', '_', text)}")
+    return os.path.join(*parts)
+
+def _column_stats(df):
+    """Return {column: [min, max]} for the numeric columns of a frame."""
+    stats = {}
+    for col in df.select_dtypes(include=[np.number]).columns:
+        values = df[col].dropna()
+        if len(values):
+            stats[col] = [_json_value(values.min()), _json_value(values.max())]
+    return stats
+
+def _write_file(df, path, schema):
+    """Write one Parquet file sorted by SORT_COLUMN with row-group statistics."""
+    if SORT_COLUMN in df.columns:
+        df = df.sort_values(SORT_COLUMN, kind='stable')
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    pq.write_table(table, path, row_group_size=ROW_GROUP_SIZE, write_statistics=True)
+    return {'rows': len(df), 'stats': _column_stats(df)}
+
+def _write_partition(df, partition, table_dir, schema):
+    """Write the rows of one partition under its hive-style directory and return its file entry."""
+    rel_dir = _partition_dir(partition) if partition else ''
+    os.makedirs(os.path.join(table_dir, rel_dir), exist_ok=True)
+    rel_path = os.path.join(rel_dir, 'part-0.parquet')
+    info = _write_file(df, os.path.join(table_dir, rel_path), schema)
+    return {'path': rel_path, 'partition': partition, **info}
+
+def _partition_key(values):
+    """A hashable key for one partition's values, as they are stored in the manifest."""
+    return tuple(_json_value(value) for value in values)
+
+def new_version_path(name):
+    """Return a new path for a version of a stored table or subset, relative to PROCESSED_DIR."""
+    return os.path.join(name, f"v-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:12]}")
+
+def write_table(df, name, partition_cols=(), extra=None):
+    """Write a DataFrame as a table, optionally partitioned by some columns.
+
+    Files go to a new version directory, so the version the current manifest
+    points at stays intact until write_manifest publishes the new one.
+    Returns the manifest entry for the table; pass the entries to
+    write_manifest once every table is on disk.
+    """
+    df = df.reset_index(drop=True)
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    path = new_version_path(name)
+    table_dir = os.path.join(PROCESSED_DIR, path)
+    os.makedirs(table_dir)
+
+    files = []
+    partition_cols = list(partition_cols)
+    if partition_cols and len(df):
+        groups = df.groupby(partition_cols, dropna=False, sort=True)
+    else:
+        groups = [((), df)]
+    for key, part in groups:
+        key = key if isinstance(key, tuple) else (key,)
+        partition = dict(zip(partition_cols, _partition_key(key)))
+        files.append(_write_partition(part, partition, table_dir, schema))
+
+    entry = {
+        'path': path,
+        'partition_cols': partition_cols,
+        'columns': list(df.columns),
+        'rows': len(df),
+        'files': files
+    }
+    entry.update(extra or {})
+    return entry
+
+def rewrite_partitions(df, name, entry, touched):
+    """Write a new version of a table in which only the touched partitions are rewritten.
+
+    df holds the new rows of the table, or at least of every touched
+    partition; touched is a frame of the partition values whose rows were
+    added, removed or edited. The files of the other partitions are
+    hard-linked from the current version rather than rewritten. Returns the
+    new manifest entry.
+    """
+    partition_cols = entry['partition_cols']
+    touched = {_partition_key(values) for values in touched[partition_cols].itertuples(index=False)}
+    old_dir = os.path.join(PROCESSED_DIR, entry['path'])
+    path = new_version_path(name)
+    table_dir = os.path.join(PROCESSED_DIR, path)
+    os.makedirs(table_dir)
+    # New files keep the stored schema, so old and new files read back alike
+    schema = (pq.read_schema(os.path.join(old_dir, entry['files'][0]['path'])) if entry['files']
+              else pa.Schema.from_pandas(df.reset_index(drop=True), preserve_index=False))
+
+    files = []
+    for file_entry in entry['files']:
+        if _partition_key(file_entry['partition'].get(col) for col in partition_cols) in touched:
+            continue
+        target = os.path.join(table_dir, file_entry['path'])
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(os.path.join(old_dir, file_entry['path']), target)
+        except OSError:
+            shutil.copy2(os.path.join(old_dir, file_entry['path']), target)
+        files.append(file_entry)
+
+    if partition_cols:
+        groups = df.groupby(partition_cols, dropna=False, sort=True).indices.items() if len(df) else []
+    else:
+        groups = [((), np.arange(len(df)))]
+    for key, positions in groups:
+        key = _partition_key(key if isinstance(key, tuple) else (key,))
+        if key in touched:
+            part = df.iloc[positions].reset_index(drop=True)
+            files.append(_write_partition(part, dict(zip(partition_cols, key)), table_dir, schema))
+
+    files.sort(key=lambda f: f['path'])
+    return {**entry, 'path': path, 'rows': sum(f['rows'] for f in files), 'files': files}
+
+def new_snapshot_id():
+    """Return a unique id for a processed-data snapshot.
+
+    The write time keeps ids readable and sortable; the random suffix keeps
+    two runs within the same second (say an incremental run right after a
+    full one) from sharing an id, and so from sharing cached results.
+    """
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:12]}"
+
+def _stored_paths(manifest):
+    """Paths, relative to PROCESSED_DIR, of the table and subset versions a manifest refers to."""
+    paths = set()
+    for entry in manifest['tables'].values():
+        if 'path' in entry:
+            paths.add(entry['path'])
+        if 'subset' in entry:
+            paths.add(entry['subset']['path'])
+    return paths
+
+def collect_garbage(manifests):
+    """Delete the stored versions none of the given manifests refers to.
+
+    Only directories holding a referenced version, and their parents below
+    PROCESSED_DIR, are swept, so other files in PROCESSED_DIR are never touched. Returns the number of paths deleted.
+    """
+    referenced = set().union(*(_stored_paths(m) for m in manifests if m))
+    roots = set()
+    for path in referenced:
+        while os.path.dirname(path):
+            path = os.path.dirname(path)
+            roots.add(path)
+    removed = 0
+    for root in sorted(roots):
+        root_dir = os.path.join(PROCESSED_DIR, root)
+        if not os.path.isdir(root_dir):
+            continue
+        for child in os.listdir(root_dir):
+            rel = os.path.join(root, child)
+            # Keep referenced versions, directories containing them, and files inside them
+            if any(path == rel or path.startswith(rel + os.sep) or rel.startswith(path + os.sep)
+                   for path in referenced):
+                continue
+            full = os.path.join(PROCESSED_DIR, rel)
+            if os.path.isdir(full):
+                shutil.rmtree(full, ignore_errors=True)
+            else:
+                os.remove(full)
+            removed += 1
+    return removed
+
+def write_manifest(entries):
+    """Publish a manifest describing every table, replacing any previous one.
+
+    The manifest is replaced atomically, so readers see either the old
+    snapshot or the new one. Versions referred to by neither are deleted
+    afterwards; the previous snapshot is kept for processes still reading it.
+    """
+    previous = None
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE) as f:
+            previous = json.load(f)
+    manifest = {
+        'layout_version': LAYOUT_VERSION,
+        'snapshot': new_snapshot_id(),
+        'tables': entries
+    }
+    temp_path = MANIFEST_FILE + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, MANIFEST_FILE)
+    collect_garbage([manifest, previous])
+    return manifest
+
+def load_manifest():
+    """Load the manifest, or None if processed data is not in this layout."""
+    if not os.path.exists(MANIFEST_FILE):
+        return None
+    with open(MANIFEST_FILE) as f:
+        manifest = json.load(f)
+    if manifest.get('layout_version') != LAYOUT_VERSION:
+        raise ValueError(
+            f"processed data layout version {manifest.get('layout_version')} is not supported "
+            f"(expected {LAYOUT_VERSION}); re-run data_preprocessing.py"
+        )
+    return manifest
+
+def _may_match(file_entry, filters):
+    """Decide from partition values and min/max stats whether a file can match."""
+    for col, op, value in filters:
+        if col in file_entry['partition']:
+            actual = file_entry['partition'][col]
+            if actual is None:
+                # As in pandas, a null value differs from everything but matches nothing else
+                if op in ('!=', 'not in'):
+                    continue
+                return False
+            if not bool(_OPERATORS[op](pd.Series([actual]), value).iloc[0]):
+                return False
+        elif col in file_entry['stats']:
+            low, high = file_entry['stats'][col]
+            if op == '==' and not low <= value <= high:
+                return False
+            if op == '<' and not low < value:
+                return False
+            if op == '<=' and not low <= value:
+                return False
+            if op == '>' and not high > value:
+                return False
+            if op == '>=' and not high >= value:
+                return False
+            if op == 'in':
+                values = np.asarray(value)
+                if not np.any((values >= low) & (values <= high)):
+                    return False
+    return True
+
+def load_row_ids(subset_entry):
+    """Load the row ids of a stored subset from its manifest entry."""
+    payload = np.load(os.path.join(PROCESSED_DIR, subset_entry['path']))
+    if subset_entry['encoding'] == 'bitmap':
+        mask = np.unpackbits(payload, count=subset_entry['base_rows']).astype(bool)
+        return np.flatnonzero(mask)
+    return payload.astype(np.int64)
+
+def _filter_expression(filters):
+    """Combine (column, op, value) filters into a pyarrow dataset expression."""
+    expression = None
+    for col, op, value in filters:
+        term = _OPERATORS[op](ds.field(col), value)
+        if op in ('!=', 'not in'):
+            # Comparisons with null are null in Arrow; pandas keeps those rows
+            term = term | ds.field(col).is_null()
+        expression = term if expression is None else expression & term
+    return expression
+
+def read_table(name, columns=None, filters=None, manifest=None):
+    """Read a table, skipping partitions, files and row groups that cannot match.
+
+    filters is a list of (column, op, value) tuples combined with AND, where
+    op is one of ==, !=, <, <=, >, >=, in and not in. As in pandas, != and
+    not in keep rows whose value is null, and the others drop them. A table entry may also
+    be a view of a base table: a column subset (for example charts_clean) or
+    a row subset stored as row ids (see subsets.py).
+    """
+    manifest = manifest or load_manifest()
+    if manifest is None:
+        raise FileNotFoundError(f"{MANIFEST_FILE} not found; run data_preprocessing.py first")
+    entry = manifest['tables'][name]
+    filters = list(filters or [])
+    if 'base' in entry:
+        if 'subset' in entry:
+            filters.append(('row_id', 'in', load_row_ids(entry['subset'])))
+        else:
+            columns = columns or entry['columns']
+        entry = manifest['tables'][entry['base']]
+
+    table_dir = os.path.join(PROCESSED_DIR, entry['path'])
+    paths = [os.path.join(table_dir, f['path']) for f in entry['files'] if _may_match(f, filters)]
+    if not paths:
+        table = pq.read_schema(os.path.join(table_dir, entry['files'][0]['path'])).empty_table()
+        return (table.select(columns) if columns else table).to_pandas()
+
+    dataset = ds.dataset(paths, format='parquet')
+    table = dataset.to_table(columns=columns, filter=_filter_expression(filters))
+    return table.to_pandas()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Analysis Subsets for Video Game Dataset Analysis
+This module defines the named analysis subsets as predicates over the merged
+charts table and stores each one as a compact row-id array or bitmap.
+"""
+
+import os
+import numpy as np
+
+from storage import PROCESSED_DIR, load_manifest, load_row_ids, new_version_path, read_table
+
+MAJOR_PUBLISHERS = ['Electronic Arts', 'Activision', 'Nintendo', 'Sony Computer Entertainment',
+                    'Microsoft', 'Ubisoft', 'Sega', 'Konami']
+
+TOP_PLATFORMS = ['PC', 'PS2', 'PS3', 'PS4', 'X360', 'XOne', 'NS', 'DS', '3DS']
+
+# name -> (label, predicate returning a boolean mask over the merged table)
+SUBSETS = {
+    'complete_sales': ('Complete sales', lambda df: df['has_complete_sales']),
+    'recent_games': ('Recent games', lambda df: df['year'] >= 2010),
+    'major_publishers': ('Major publishers', lambda df: df['publisher'].isin(MAJOR_PUBLISHERS)),
+    'top_platforms': ('Top platforms', lambda df: df['platform'].isin(TOP_PLATFORMS))
+}
+
+def select_row_ids(df, predicate):
+    """Return the sorted row ids of the rows matching a predicate."""
+    mask = np.asarray(predicate(df), dtype=bool)
+    return df['row_id'].to_numpy()[mask]
+
+def save_subset(name, row_ids, base_rows, base='charts'):
+    """Save a subset as row ids or a bitmap, whichever is smaller.
+
+    A bitmap costs one bit per base row and an id array four bytes per
+    matching row, so bitmaps win once more than 1 in 32 rows match.
+    Returns the manifest entry for the subset.
+    """
+    if len(row_ids) * 4 <= (base_rows + 7) // 8:
+        encoding = 'ids'
+        payload = np.asarray(row_ids, dtype=np.uint32)
+    else:
+        encoding = 'bitmap'
+        mask = np.zeros(base_rows, dtype=bool)
+        mask[row_ids] = True
+        payload = np.packbits(mask)
+
+    # A new file per version; the one the current manifest points at stays until it is replaced
+    path = new_version_path(os.path.join('subsets', name)) + '.npy'
+    os.makedirs(os.path.join(PROCESSED_DIR, os.path.dirname(path)), exist_ok=True)
+    np.save(os.path.join(PROCESSED_DIR, path), payload)
+    return {
+        'base': base,
+        'subset': {'path': path, 'encoding': encoding, 'rows': len(row_ids), 'base_rows': base_rows}
+    }
+
+class SubsetView:
+    """A lazy view of a named subset; rows are only read when asked for."""
+
+    def __init__(self, name, manifest=None):
+        self.name = name
+        self.manifest = manifest or load_manifest()
+        self.entry = self.manifest['tables'][name]
+        self._row_ids = None
+
+    def __len__(self):
+        return self.entry['subset']['rows']
+
+    @property
+    def row_ids(self):
+        if self._row_ids is None:
+            self._row_ids = load_row_ids(self.entry['subset'])
+        return self._row_ids
+
+    def to_frame(self, columns=None, filters=None):
+        """Materialise the subset with only the requested columns."""
+        return read_table(self.name, columns=columns, filters=filters, manifest=self.manifest)
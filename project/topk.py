@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Top-k Index for Video Game Dataset Analysis
+This module keeps the charts rows presorted by a sort key within each
+(platform, genre) cell, so the top N games for any filter combination and
+year range come from a k-way heap merge over the matching cells instead of
+a scan of the whole table.
+"""
+
+import heapq
+from itertools import islice
+
+import numpy as np
+
+CELL_COLUMNS = ['platform', 'genre']
+SORT_KEYS = ['total_sales', 'critic_score']
+
+class _SortedCells:
+    """Row positions of one sort key, ordered by cell, then key descending, then row order."""
+
+    def __init__(self, df, key, cell_codes, n_cells):
+        values = df[key].to_numpy(dtype=np.float64)
+        # Rows without a value never rank, as in nlargest
+        rows = np.flatnonzero(~np.isnan(values))
+        order = np.lexsort((rows, -values[rows], cell_codes[rows]))
+        self.rows = rows[order]
+        self.values = values[self.rows]
+        self.bounds = np.searchsorted(cell_codes[self.rows], np.arange(n_cells + 1))
+
+class TopKIndex:
+    """Answers top-N queries per sort key from presorted (platform, genre) cells."""
+
+    def __init__(self, df, keys=SORT_KEYS, cell_columns=CELL_COLUMNS):
+        self.df = df.reset_index(drop=True)
+        self.cell_columns = list(cell_columns)
+        cell_codes = self.df.groupby(self.cell_columns, dropna=False, sort=False).ngroup().to_numpy()
+        first = np.unique(cell_codes, return_index=True)[1]
+        self.cells = self.df[self.cell_columns].iloc[first].reset_index(drop=True)
+        self.sorted = {key: _SortedCells(self.df, key, cell_codes, len(self.cells)) for key in keys}
+
+    def _cell_ids(self, equals, isin):
+        """Return the cells matching the equality and isin filters on the cell columns."""
+        mask = np.ones(len(self.cells), dtype=bool)
+        for col, value in (equals or {}).items():
+            if col in self.cell_columns:
+                mask &= (self.cells[col] == value).to_numpy()
+        for col, values in (isin or {}).items():
+            if col in self.cell_columns:
+                mask &= self.cells[col].isin(values).to_numpy()
+        return np.flatnonzero(mask)
+
+    def _keep(self, rows, filters):
+        """Mask of the rows passing the equality, isin and range filters on non-cell columns."""
+        equals, isin, ranges = filters
+        mask = np.ones(len(rows), dtype=bool)
+        for col, value in (equals or {}).items():
+            if col not in self.cell_columns:
+                mask &= self.df[col].to_numpy()[rows] == value
+        for col, values in (isin or {}).items():
+            if col not in self.cell_columns:
+                mask &= np.isin(self.df[col].to_numpy()[rows], list(values))
+        for col, (low, high) in (ranges or {}).items():
+            values = self.df[col].to_numpy()[rows]
+            mask &= (values >= low) & (values <= high)
+        return mask
+
+    def _cell_stream(self, sorted_cells, cell, n, filters):
+        """Yield (-value, row) for one cell in rank order, skipping rows that fail the filters.
+
+        Rows are checked in blocks that start at n and double, so a cell
+        costs about n / selectivity row checks rather than its full size.
+        """
+        start, stop = sorted_cells.bounds[cell], sorted_cells.bounds[cell + 1]
+        block = max(n, 1)
+        while start < stop:
+            end = min(start + block, stop)
+            rows = sorted_cells.rows[start:end]
+            keep = self._keep(rows, filters)
+            yield from zip((-sorted_cells.values[start:end][keep]).tolist(), rows[keep].tolist())
+            start, block = end, block * 2
+
+    def top_rows(self, n, by='total_sales', equals=None, ranges=None, isin=None):
+        """Return the positions of the top n rows by a sort key, best first.
+
+        Filters on the cell columns pick cells; filters on other columns are
+        checked row by row like the ranges. Ties are broken by row order, so
+        the same rows as DataFrame.nlargest are returned.
+        """
+        if by not in self.sorted:
+            raise ValueError(f"no top-k index for {by}; indexed keys: {', '.join(self.sorted)}")
+        sorted_cells = self.sorted[by]
+        filters = (equals, isin, ranges)
+        streams = [self._cell_stream(sorted_cells, cell, n, filters) for cell in self._cell_ids(equals, isin)]
+        return np.array([row for _, row in islice(heapq.merge(*streams), n)], dtype=np.int64)
+
+    def top(self, n, by='total_sales', columns=None, equals=None, ranges=None, isin=None):
+        """Return the top n rows by a sort key as a DataFrame."""
+        top = self.df.iloc[self.top_rows(n, by, equals, ranges, isin)]
+        return (top if columns is None else top[columns]).reset_index(drop=True)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Data Validation for Video Game Dataset Analysis
+This module checks the merged charts table against a declarative list of
+data-quality rules and writes a compact violation report. Each rule is a
+vectorized expression over a chunk of rows, so the table is checked chunk by
+chunk in a few passes over its columns, never row by row.
+"""
+
+import os
+import json
+import time
+import argparse
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+
+REPORT_FILE = 'reports/validation.json'
+
+# Rows checked at a time; bounds the temporary masks on the full feed
+CHUNK_ROWS = 1_000_000
+
+# Row ids kept per check as examples of its violations
+SAMPLE_ROWS = 10
+
+REGION_COLUMNS = ['na_sales', 'jp_sales', 'pal_sales', 'other_sales']
+SALES_COLUMNS = REGION_COLUMNS + ['total_sales']
+
+# Regional sales and totals are rounded to 0.01M each, so their sum can drift by a few hundredths
+SALES_TOLERANCE = 0.03
+
+# Critic scores are out of 10; 0 is the fill value for a missing score
+CRITIC_SCORE_RANGE = (0, 10)
+
+# No console game was released before 1970, and none far in the future
+MIN_YEAR = 1970
+MAX_YEAR = date.today().year + 1
+
+# A rule maps a chunk of the table to a boolean mask of the rows breaking it
+Check = namedtuple('Check', ['name', 'description', 'columns', 'rule'])
+
+def check(name, description, columns, rule):
+    """Create a validation check."""
+    return Check(name, description, tuple(columns), rule)
+
+def _values(chunk, column):
+    """A column as floats, with NaN for missing values."""
+    return chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+def _orphaned(key, joined):
+    """Rows whose key is known but found no row in its lookup table (the joined column is empty)."""
+    return lambda chunk: (chunk[key] != 'Unknown').to_numpy() & chunk[joined].isna().to_numpy()
+
+CHECKS = [
+    check('regional_sum_mismatch',
+          f"regional sales of a game with all four regions reported differ from total_sales "
+          f"by more than {SALES_TOLERANCE}M",
+          ['calculated_total', 'total_sales', 'has_complete_sales'],
+          lambda chunk: chunk['has_complete_sales'].to_numpy(dtype=bool)
+          & (np.abs(_values(chunk, 'calculated_total') - _values(chunk, 'total_sales')) > SALES_TOLERANCE)),
+    check('regional_sum_exceeds_total',
+          "regional sales of a game with some regions missing add up to more than total_sales",
+          ['calculated_total', 'total_sales', 'has_complete_sales'],
+          lambda chunk: ~chunk['has_complete_sales'].to_numpy(dtype=bool)
+          & (_values(chunk, 'calculated_total') > _values(chunk, 'total_sales') + SALES_TOLERANCE)),
+    check('negative_sales', "a sales column is negative", SALES_COLUMNS,
+          lambda chunk: (chunk[SALES_COLUMNS].to_numpy(dtype=np.float64, na_value=0) < 0).any(axis=1)),
+    check('critic_score_out_of_range',
+          f"critic_score lies outside {CRITIC_SCORE_RANGE[0]}-{CRITIC_SCORE_RANGE[1]}", ['critic_score'],
+          lambda chunk: (_values(chunk, 'critic_score') < CRITIC_SCORE_RANGE[0])
+          | (_values(chunk, 'critic_score') > CRITIC_SCORE_RANGE[1])),
+    check('impossible_year', f"release year before {MIN_YEAR} or after {MAX_YEAR}", ['year'],
+          lambda chunk: (_values(chunk, 'year') < MIN_YEAR) | (_values(chunk, 'year') > MAX_YEAR)),
+    check('orphaned_publisher', "publisher has no entry in the publishers table, even through an alias",
+          ['publisher', 'city_pub'], _orphaned('publisher', 'city_pub')),
+    check('orphaned_developer', "developer has no entry in the developers table, even through an alias",
+          ['developer', 'city'], _orphaned('developer', 'city')),
+]
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    """Yield consecutive row slices of a frame."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def validate_chunks(chunks, checks=CHECKS, sample_rows=SAMPLE_ROWS):
+    """Run every check over a stream of chunks and return the violation report.
+
+    Chunks can come from a frame or straight from a reader, so the report
+    never needs the whole table in memory. Row ids come from the row_id
+    column when present, else from the row's position in the stream. Checks
+    whose columns are missing are listed as skipped.
+    """
+    start = time.perf_counter()
+    counts = {c.name: 0 for c in checks}
+    samples = {c.name: [] for c in checks}
+    skipped = set()
+    rows = 0
+    for chunk in chunks:
+        ids = chunk['row_id'].to_numpy() if 'row_id' in chunk else np.arange(rows, rows + len(chunk))
+        for c in checks:
+            if not set(c.columns) <= set(chunk.columns):
+                skipped.add(c.name)
+                continue
+            bad = np.flatnonzero(c.rule(chunk))
+            counts[c.name] += len(bad)
+            samples[c.name] += ids[bad[:sample_rows - len(samples[c.name])]].tolist()
+        rows += len(chunk)
+
+    return {
+        'rows': rows,
+        'seconds': round(time.perf_counter() - start, 3),
+        'checks': [
+            {'name': c.name, 'description': c.description,
+             'violations': None if c.name in skipped else counts[c.name],
+             'rate': None if c.name in skipped else round(counts[c.name] / max(rows, 1), 6),
+             'sample_row_ids': samples[c.name]}
+            for c in checks
+        ]
+    }
+
+def validate(df, checks=CHECKS, chunk_rows=CHUNK_ROWS):
+    """Run every check over a frame in chunks of chunk_rows rows."""
+    return validate_chunks(iter_chunks(df, chunk_rows), checks)
+
+def print_validation_report(report):
+    """Print one line per check with its violation count."""
+    print(f"\nValidating {report['rows']:,} rows ({report['seconds']:.2f}s)...")
+    for entry in report['checks']:
+        if entry['violations'] is None:
+            print(f"  - {entry['name']}: skipped, columns missing")
+        elif entry['violations']:
+            print(f"  ⚠ {entry['name']}: {entry['violations']:,} rows ({entry['rate']:.2%}), "
+                  f"e.g. row ids {', '.join(map(str, entry['sample_row_ids'][:5]))}")
+        else:
+            print(f"  ✓ {entry['name']}: no violations")
+
+def save_validation_report(report, path=REPORT_FILE):
+    """Print the report and write it as JSON."""
+    print_validation_report(report)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=1)
+    return report
+
+if __name__ == "__main__":
+    from storage import read_table
+
+    parser = argparse.ArgumentParser(description="Validate the processed charts table.")
+    parser.add_argument('--output', default=REPORT_FILE, help=f"report file (default: {REPORT_FILE})")
+    args = parser.parse_args()
+
+    columns = sorted({'row_id'} | {col for c in CHECKS for col in c.columns})
+    save_validation_report(validate(read_table('charts', columns=columns)), args.output)